@@ -165,9 +165,9 @@ def emit_python_function_static(visitor: pythonj.LoweringVisitor, func_name: str
         else:
             func_code.append(ir.LocalDecl(visitor.java_local_type(arg_name), f'pylocal_{arg_name}', visitor.cast_local_assignment(arg_name, ir.Identifier(f'pyarg_{arg_name}'))))
     for name in sorted(visitor.scope.info.cell_vars - set(arg_names)):
-        func_code.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.Null()])))
+        func_code.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.NULL])))
     for name in sorted(visitor.scope.info.locals - visitor.scope.info.cell_vars - set(arg_names) - set(visitor.scope.info.initial_builtin_module_locals)):
-        func_code.append(ir.LocalDecl(visitor.java_local_type(name), f'pylocal_{name}', ir.Null()))
+        func_code.append(ir.LocalDecl(visitor.java_local_type(name), f'pylocal_{name}', ir.NULL))
     if return_java_type == 'NoReturn':
         func_code.extend(ir.block_simplify(body))
     else:
@@ -323,7 +323,7 @@ def build_wrapper_binding_ir(
             ir.PyConstant(plan.posonly_min_max_range[0]), ir.PyConstant(plan.posonly_min_max_range[1]),
         ]))
         bind_args = [ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)) for i in range(plan.posonly_min_max_range[0])]
-        bind_args.extend(ir.CondOp(ir.BinaryOp('>', ir.Field(ir.Identifier('args'), 'length'), ir.IntLiteral(i)), ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)), ir.Null()) for i in range(plan.posonly_min_max_range[0], plan.posonly_min_max_range[1]))
+        bind_args.extend(ir.CondOp(ir.BinaryOp('>', ir.Field(ir.Identifier('args'), 'length'), ir.IntLiteral(i)), ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)), ir.NULL) for i in range(plan.posonly_min_max_range[0], plan.posonly_min_max_range[1]))
     elif plan.mode == 'poskw_min_max_python':
         assert kwarg_params is not None
         (min_args, max_args) = extract_spec.get_positional_call_range(kwarg_params.params)
@@ -391,7 +391,7 @@ def build_call_positional_ir(shape: SignatureShape) -> tuple[list[str], list[ir.
         if param.default is not inspect.Parameter.empty:
             local = ir.Identifier(java_local_name(shape.params[i].name))
             statements.append(ir.LocalDecl('PyObject', java_local_name(shape.params[i].name), ir.Identifier(f'arg{i}')))
-            statements.append(ir.IfStatement(ir.BinaryOp('==', local, ir.Null()), [ir.AssignStatement(local, pythonj.emit_default_java_expr(shape.params[i].default))], []))
+            statements.append(ir.IfStatement(ir.BinaryOp('==', local, ir.NULL), [ir.AssignStatement(local, pythonj.emit_default_java_expr(shape.params[i].default))], []))
             bind_args.append(local)
         else:
             bind_args.append(ir.Identifier(f'arg{i}'))
@@ -533,7 +533,7 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                         ir.Identifier('singleton'),
                         ir.StrLiteral(k),
                         ir.MethodRef(getter_target_class, getter_target_method),
-                        ir.Null() if doc_value is None else ir.StrLiteral(doc_value),
+                        ir.NULL if doc_value is None else ir.StrLiteral(doc_value),
                     ])
                 elif v['kind'] == 'getset':
                     getter_target_class = java_name
@@ -560,28 +560,28 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                         ir.Identifier('singleton'),
                         ir.StrLiteral(k),
                         ir.MethodRef(getter_target_class, getter_target_method),
-                        ir.Null() if doc_value is None else ir.StrLiteral(doc_value),
+                        ir.NULL if doc_value is None else ir.StrLiteral(doc_value),
                     ])
                 elif v['kind'] == 'method':
                     value = ir.CreateObject('PyMethodDescriptor', [
                         ir.Identifier('singleton'),
                         ir.StrLiteral(k),
                         ir.MethodRef(f'{java_name}Method_{k}', 'new'),
-                        ir.Null() if doc_value is None else ir.StrLiteral(doc_value),
+                        ir.NULL if doc_value is None else ir.StrLiteral(doc_value),
                     ])
                 elif v['kind'] == 'wrapper_descriptor':
                     value = ir.CreateObject('PyWrapperDescriptor', [
                         ir.Identifier('singleton'),
                         ir.StrLiteral(k),
                         ir.MethodRef(f'{java_name}MethodWrapper_{k}', 'new'),
-                        ir.Null() if doc_value is None else ir.StrLiteral(doc_value),
+                        ir.NULL if doc_value is None else ir.StrLiteral(doc_value),
                     ])
                 elif v['kind'] == 'classmethod':
                     value = ir.CreateObject('PyClassMethodDescriptor', [
                         ir.Identifier('singleton'),
                         ir.StrLiteral(k),
                         ir.MethodRef(f'{java_name}ClassMethod_{k}', 'new'),
-                        ir.Null() if doc_value is None else ir.StrLiteral(doc_value),
+                        ir.NULL if doc_value is None else ir.StrLiteral(doc_value),
                     ])
                 elif v['kind'] == 'staticmethod':
                     value = ir.CreateObject('PyStaticMethod', [
@@ -618,8 +618,8 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                 base_type_java = pythonj.get_java_name(base_type_name)
                 super_args.append(ir.Field(ir.Identifier(f'{base_type_java}Type'), 'singleton'))
             else:
-                super_args.append(ir.Null())
-            super_args.append(ir.StrLiteral(doc_string) if doc_string is not None else ir.Null())
+                super_args.append(ir.NULL)
+            super_args.append(ir.StrLiteral(doc_string) if doc_string is not None else ir.NULL)
             type_decls.append(ir.ConstructorDecl('private', f'{java_name}Type', [], [
                 ir.SuperConstructorCall(super_args),
             ]))
@@ -628,7 +628,7 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                     ir.MethodCall(
                         ir.Identifier(java_name if name in java_authored_constructor_impls else 'PyRuntime'),
                         'newObj' if name in java_authored_constructor_impls else f'pyfunc_{name}__newobj',
-                        [ir.This(), ir.Identifier('args'), ir.Identifier('kwargs')],
+                        [ir.THIS, ir.Identifier('args'), ir.Identifier('kwargs')],
                     )
                 ),
             ]))
@@ -639,7 +639,7 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                 ir.SwitchStatement(ir.Identifier('name'), [
                     ir.SwitchCase(ir.StrLiteral(k), ir.Field(ir.Identifier('AttrsHolder'), f'pyattr_{k}'))
                     for k in attrs
-                ], ir.MethodCall(ir.This(), 'lookupBaseAttr', [ir.Identifier('name')])),
+                ], ir.MethodCall(ir.THIS, 'lookupBaseAttr', [ir.Identifier('name')])),
             ]))
             top_level_decls.append(ir.ClassDecl('final', f'{java_name}Type', 'PyConcreteType', type_decls))
 
@@ -928,7 +928,7 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                             ir.Identifier('type'),
                             ir.CreateObject('PyTuple', [ir.Identifier('args')]),
                             ir.CondOp(
-                                ir.BinaryOp('!=', ir.Identifier('kwargs'), ir.Null()),
+                                ir.BinaryOp('!=', ir.Identifier('kwargs'), ir.NULL),
                                 ir.Identifier('kwargs'),
                                 ir.CreateObject('PyDict', []),
                             ),
@@ -1067,11 +1067,8 @@ def gen_runtime_artifacts(spec_path: str, java_path: str, semantics_path: str) -
                 ))
             top_level_decls.append(ir.ClassDecl('final', f'PyBuiltinFunction_{func_name}', 'PyBuiltinFunction', decls))
 
-        py_runtime_decl = ir.ClassDecl('final', 'PyRuntime', None, python_helper_methods)
-        for decl in [*top_level_decls, py_runtime_decl]:
-            for _ in decl.emit_java(pool):
-                pass
-        top_level_decls.append(ir.with_pooled_fields(py_runtime_decl, pool))
+        # PyRuntime comes last so that its pool fields cover the constants of every class emitted before it
+        top_level_decls.append(ir.ClassDecl('final', 'PyRuntime', None, python_helper_methods, holds_pool=True))
         ir.write_decls(f, top_level_decls, pool)
 
 def main() -> None:
@@ -3,9 +3,12 @@
 # SPDX-License-Identifier: MIT
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import functools
 import math
-from typing import Iterator, Optional, TextIO
+import re
+import types
+from typing import Any, Callable, Iterator, Optional, TextIO
 
 JAVA_FORBIDDEN_IDENTIFIERS = {
     '_', 'abstract', 'assert', 'boolean', 'break', 'byte', 'case', 'catch', 'char', 'class', 'const',
@@ -60,39 +63,47 @@ CHAR_ESCAPE = {
     '\b': r'\b',
     '\f': r'\f',
 }
+class _JavaEscapeTable(dict[int, str]):
+    """Map from code points to Java string literal text, filled in on first use of each code point."""
+    def __missing__(self, o: int) -> str:
+        if 0xD800 <= o <= 0xDFFF:
+            raise ValueError('surrogate code point')
+        if 0x20 <= o <= 0x7E: # safe ASCII
+            escaped = chr(o)
+        elif o <= 0xFFFF:
+            escaped = f'\\u{o:04x}'
+        else:
+            high = 0xD800 | ((o - 0x10000) >> 10)
+            low = 0xDC00 | ((o - 0x10000) & 0x3FF)
+            escaped = f'\\u{high:04x}\\u{low:04x}'
+        self[o] = escaped
+        return escaped
+_JAVA_ESCAPE_TABLE = _JavaEscapeTable({ord(c): escaped for (c, escaped) in CHAR_ESCAPE.items()})
+_JAVA_ASCII_ESCAPES = [_JAVA_ESCAPE_TABLE[o] for o in range(0x80)] # precomputed list lookup beats a dict (subclass) lookup per char
+_JAVA_ESCAPE_RE = re.compile(r'[^\x20\x21\x23-\x5b\x5d-\x7e]') # everything except safe ASCII other than '"' and '\\'
+
+@functools.cache # the same strings (attribute names, messages) recur heavily within a translation
 def _java_string_literal(s: str) -> str:
     """Escape a Python string into a Java string literal with all special characters escaped."""
-    out = ['"']
-    for c in s:
-        if c in CHAR_ESCAPE:
-            out.append(CHAR_ESCAPE[c])
-        else:
-            o = ord(c)
-            if 0xD800 <= o <= 0xDFFF:
-                raise ValueError(f'cannot encode string containing surrogate code points: {s!r}')
-            if 0x20 <= o <= 0x7E: # safe ASCII
-                out.append(c)
-            elif o <= 0xFFFF:
-                out.append(f'\\u{o:04x}')
-            else:
-                o -= 0x10000
-                high = 0xD800 | (o >> 10)
-                low = 0xDC00 | (o & 0x3FF)
-                out.append(f'\\u{high:04x}\\u{low:04x}')
-    out.append('"')
-    return ''.join(out)
+    # str.translate is fastest for ASCII; for anything else, only call back into Python for the characters that need escaping
+    if s.isascii():
+        return f'"{s.translate(_JAVA_ASCII_ESCAPES)}"'
+    try:
+        return f'"{_JAVA_ESCAPE_RE.sub(lambda m: _JAVA_ESCAPE_TABLE[ord(m.group())], s)}"'
+    except ValueError:
+        raise ValueError(f'cannot encode string containing surrogate code points: {s!r}') from None
 
 class ConstantPool:
     __slots__ = ('all_ints', 'all_strings', 'all_floats', 'all_tuples', 'all_bytes', 'owner_name')
-    all_ints: set[int]
-    all_strings: dict[str, int]
-    all_floats: dict[str, tuple[float, int]]
-    all_tuples: dict[tuple[object, ...], int]
-    all_bytes: dict[bytes, int]
+    all_ints: dict[int, str] # pooled value -> qualified field name; likewise for strings and bytes
+    all_strings: dict[str, str]
+    all_floats: dict[str, tuple[float, str]] # keyed by float.hex() so that 0.0 and -0.0 stay distinct
+    all_tuples: dict[tuple[object, ...], str]
+    all_bytes: dict[bytes, str]
     owner_name: Optional[str]
 
     def __init__(self, owner_name: Optional[str] = None):
-        self.all_ints = set()
+        self.all_ints = {}
         self.all_strings = {}
         self.all_floats = {}
         self.all_tuples = {}
@@ -103,74 +114,100 @@ class ConstantPool:
         return name if self.owner_name is None else f'{self.owner_name}.{name}'
 
     def emit_constant(self, value: object) -> str:
-        if value is None:
-            return 'PyNone.singleton'
-        elif value is Ellipsis:
-            return 'PyEllipsis.singleton'
-        elif value is False or value is True:
-            return f'PyBool.{str(value).lower()}_singleton'
-        elif isinstance(value, int):
-            if -1 <= value <= 1:
-                if value < 0:
-                    return f'PyInt.singleton_neg{-value}'
-                else:
-                    return f'PyInt.singleton_{value}'
-            self.all_ints.add(value)
-            return self.qualify_name(_int_name(value))
-        elif isinstance(value, str):
-            if not value:
-                return 'PyString.empty_singleton'
-            if value not in self.all_strings:
-                self.all_strings[value] = len(self.all_strings)
-            return self.qualify_name(f'str_singleton_{self.all_strings[value]}')
-        elif isinstance(value, float):
-            if math.isnan(value):
-                return 'PyFloat.nan_singleton'
-            key = value.hex()
-            if key not in self.all_floats:
-                self.all_floats[key] = (value, len(self.all_floats))
-            return self.qualify_name(f'float_singleton_{self.all_floats[key][1]}')
-        elif isinstance(value, tuple):
-            if not value:
-                return 'PyTuple.empty_singleton'
-            if value not in self.all_tuples:
-                for x in value:
-                    self.emit_constant(x)
-                self.all_tuples[value] = len(self.all_tuples)
-            return self.qualify_name(f'tuple_singleton_{self.all_tuples[value]}')
-        else:
-            assert isinstance(value, bytes), value
-            if not value:
-                return 'PyBytes.empty_singleton'
-            if value not in self.all_bytes:
-                self.all_bytes[value] = len(self.all_bytes)
-            return self.qualify_name(f'bytes_singleton_{self.all_bytes[value]}')
+        emitter = CONSTANT_EMITTERS.get(type(value))
+        assert emitter is not None, value
+        return emitter(self, value)
+
+    def emit_int(self, value: int) -> str:
+        if -1 <= value <= 1:
+            if value < 0:
+                return f'PyInt.singleton_neg{-value}'
+            else:
+                return f'PyInt.singleton_{value}'
+        name = self.all_ints.get(value)
+        if name is None:
+            name = self.all_ints[value] = self.qualify_name(_int_name(value))
+        return name
+
+    def emit_str(self, value: str) -> str:
+        if not value:
+            return 'PyString.empty_singleton'
+        name = self.all_strings.get(value)
+        if name is None:
+            name = self.all_strings[value] = self.qualify_name(f'str_singleton_{len(self.all_strings)}')
+        return name
+
+    def emit_float(self, value: float) -> str:
+        if math.isnan(value):
+            return 'PyFloat.nan_singleton'
+        key = value.hex()
+        entry = self.all_floats.get(key)
+        if entry is None:
+            entry = self.all_floats[key] = (value, self.qualify_name(f'float_singleton_{len(self.all_floats)}'))
+        return entry[1]
+
+    def emit_tuple(self, value: tuple[object, ...]) -> str:
+        if not value:
+            return 'PyTuple.empty_singleton'
+        name = self.all_tuples.get(value)
+        if name is None:
+            for x in value:
+                self.emit_constant(x)
+            name = self.all_tuples[value] = self.qualify_name(f'tuple_singleton_{len(self.all_tuples)}')
+        return name
+
+    def emit_bytes(self, value: bytes) -> str:
+        if not value:
+            return 'PyBytes.empty_singleton'
+        name = self.all_bytes.get(value)
+        if name is None:
+            name = self.all_bytes[value] = self.qualify_name(f'bytes_singleton_{len(self.all_bytes)}')
+        return name
 
     def build_field_decls(self) -> list[Decl]:
         decls: list[Decl] = []
         field_prefix = 'private static final' if self.owner_name is None else 'static final'
-        for i in sorted(self.all_ints):
+        for i in self.all_ints:
             value = CreateObject('PyInt', [IntLiteral(i, 'L')])
             decls.append(FieldDecl(field_prefix, 'PyInt', _int_name(i), value))
-        for (k, v) in sorted(self.all_strings.items()):
+        for (i, k) in enumerate(self.all_strings):
             value = CreateObject('PyString', [StrLiteral(k)])
-            decls.append(FieldDecl(field_prefix, 'PyString', f'str_singleton_{v}', value))
-        for (_, (k, v)) in sorted(self.all_floats.items(), key=lambda item: item[1][1]):
-            decls.append(FieldDecl(field_prefix, 'PyFloat', f'float_singleton_{v}', CreateObject('PyFloat', [FloatLiteral(k)])))
-        for (k, v) in sorted(self.all_tuples.items(), key=lambda x: x[1]):
+            decls.append(FieldDecl(field_prefix, 'PyString', f'str_singleton_{i}', value))
+        for (i, (k, _)) in enumerate(self.all_floats.values()):
+            decls.append(FieldDecl(field_prefix, 'PyFloat', f'float_singleton_{i}', CreateObject('PyFloat', [FloatLiteral(k)])))
+        for (i, k) in enumerate(self.all_tuples):
             value = CreateObject('PyTuple', [CreateArray('PyObject', [PyConstant(x) for x in k])])
-            decls.append(FieldDecl(field_prefix, 'PyTuple', f'tuple_singleton_{v}', value))
-        for (k, v) in sorted(self.all_bytes.items()):
-            value = CreateObject('PyBytes', [CreateArray('byte', [IntLiteral(((x + 0x80) & 0xFF) - 0x80, '') for x in k])])
-            decls.append(FieldDecl(field_prefix, 'PyBytes', f'bytes_singleton_{v}', value))
+            decls.append(FieldDecl(field_prefix, 'PyTuple', f'tuple_singleton_{i}', value))
+        for (i, k) in enumerate(self.all_bytes):
+            value = CreateObject('PyBytes', [ByteArrayLiteral(k)])
+            decls.append(FieldDecl(field_prefix, 'PyBytes', f'bytes_singleton_{i}', value))
         return decls
 
-def with_pooled_fields(class_decl: ClassDecl, pool: ConstantPool) -> ClassDecl:
-    for _ in class_decl.emit_java(pool):
-        pass
-    return ClassDecl(class_decl.modifiers, class_decl.name, class_decl.extends, [*pool.build_field_decls(), *class_decl.decls])
+# keyed by exact type: bool must not fall through to int, and True == 1 rules out keying singletons by value
+CONSTANT_EMITTERS: dict[type, Callable[[ConstantPool, Any], str]] = {
+    types.NoneType: lambda pool, value: 'PyNone.singleton',
+    types.EllipsisType: lambda pool, value: 'PyEllipsis.singleton',
+    bool: lambda pool, value: 'PyBool.true_singleton' if value else 'PyBool.false_singleton',
+    int: ConstantPool.emit_int,
+    str: ConstantPool.emit_str,
+    float: ConstantPool.emit_float,
+    tuple: ConstantPool.emit_tuple,
+    bytes: ConstantPool.emit_bytes,
+}
+PY_CONSTANT_JAVA_TYPES = {
+    types.NoneType: 'PyNone',
+    types.EllipsisType: 'PyEllipsis',
+    bool: 'PyBool',
+    int: 'PyInt',
+    str: 'PyString',
+    float: 'PyFloat',
+    tuple: 'PyTuple',
+    bytes: 'PyBytes',
+}
 
 class Expr(ABC):
+    __slots__ = ()
+
     def java_type(self) -> str:
         return JAVA_TYPE_UNKNOWN
 
@@ -181,35 +218,46 @@ class Expr(ABC):
         return self
 
     @abstractmethod
-    def emit_java(self, pool: ConstantPool) -> str:
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
         raise NotImplementedError()
 
-@dataclass(slots=True)
+    def emit_java_str(self, pool: ConstantPool) -> str:
+        out: list[str] = []
+        self.emit_java(out, pool)
+        return ''.join(out)
+
+def emit_java_list(exprs: list[Expr], out: list[str], pool: ConstantPool) -> None:
+    for (i, expr) in enumerate(exprs):
+        if i:
+            out.append(', ')
+        expr.emit_java(out, pool)
+
+@dataclass(slots=True, eq=False)
 class IntLiteral(Expr):
     value: int
     suffix: str = ''
     def java_type(self) -> str:
         return 'long' if self.suffix == 'L' else 'int'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.value}{self.suffix}'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.value}{self.suffix}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class FloatLiteral(Expr):
     value: float
     def java_type(self) -> str:
         return 'double'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.value!r}'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.value!r}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class StrLiteral(Expr):
     s: str
     def java_type(self) -> str:
         return 'String'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return _java_string_literal(self.s)
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(_java_string_literal(self.s))
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Identifier(Expr):
     name: str
     java_type_hint: str = JAVA_TYPE_UNKNOWN
@@ -217,63 +265,63 @@ class Identifier(Expr):
         assert self.name not in JAVA_FORBIDDEN_IDENTIFIERS, self.name
     def java_type(self) -> str:
         return self.java_type_hint
-    def emit_java(self, pool: ConstantPool) -> str:
-        return self.name
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(self.name)
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class PyBuiltinFunction(Expr):
     name: str
     java_name: Optional[str] = None
     def java_type(self) -> str:
         return self.java_name if self.java_name is not None else f'PyBuiltinFunction_{self.name}'
-    def emit_java(self, pool: ConstantPool) -> str:
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
         java_name = self.java_name if self.java_name is not None else f'PyBuiltinFunction_{self.name}'
-        return f'{java_name}.singleton'
+        out.append(f'{java_name}.singleton')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class PyBuiltinType(Expr):
     name: str
     java_name: str
     def java_type(self) -> str:
         return f'{self.java_name}Type'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.java_name}Type.singleton'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.java_name}Type.singleton')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class PyBuiltinModule(Expr):
     name: str
     java_name: str
     def java_type(self) -> str:
         return self.java_name
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.java_name}.singleton'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.java_name}.singleton')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Null(Expr):
     def java_type(self) -> str:
         return 'null'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return 'null'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('null')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class This(Expr):
-    def emit_java(self, pool: ConstantPool) -> str:
-        return 'this'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('this')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Super(Expr):
-    def emit_java(self, pool: ConstantPool) -> str:
-        return 'super'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('super')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Bool(Expr):
     value: bool
     def java_type(self) -> str:
         return 'boolean'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return 'true' if self.value else 'false'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('true' if self.value else 'false')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class Field(Expr):
     obj: Expr
     field: str
@@ -285,10 +333,11 @@ class Field(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.obj = transformer.transform_expr(self.obj)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.obj.emit_java(pool)}.{self.field}'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        self.obj.emit_java(out, pool)
+        out.append(f'.{self.field}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ArrayAccess(Expr):
     obj: Expr
     index: Expr
@@ -299,10 +348,13 @@ class ArrayAccess(Expr):
         self.obj = transformer.transform_expr(self.obj)
         self.index = transformer.transform_expr(self.index)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.obj.emit_java(pool)}[{self.index.emit_java(pool)}]'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        self.obj.emit_java(out, pool)
+        out.append('[')
+        self.index.emit_java(out, pool)
+        out.append(']')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class CastExpr(Expr):
     type: str
     expr: Expr
@@ -313,12 +365,15 @@ class CastExpr(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.expr = transformer.transform_expr(self.expr)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
         if self.expr.java_type() == self.type:
-            return self.expr.emit_java(pool)
-        return f'(({self.type}){self.expr.emit_java(pool)})'
+            self.expr.emit_java(out, pool)
+            return
+        out.append(f'(({self.type})')
+        self.expr.emit_java(out, pool)
+        out.append(')')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class UnaryOp(Expr):
     op: str
     operand: Expr
@@ -331,10 +386,12 @@ class UnaryOp(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.operand = transformer.transform_expr(self.operand)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'({self.op}{self.operand.emit_java(pool)})'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'({self.op}')
+        self.operand.emit_java(out, pool)
+        out.append(')')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class BinaryOp(Expr):
     op: str
     lhs: Expr
@@ -350,10 +407,40 @@ class BinaryOp(Expr):
         self.lhs = transformer.transform_expr(self.lhs)
         self.rhs = transformer.transform_expr(self.rhs)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'({self.lhs.emit_java(pool)} {self.op} {self.rhs.emit_java(pool)})'
-
-@dataclass(slots=True)
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('(')
+        self.lhs.emit_java(out, pool)
+        out.append(f' {self.op} ')
+        self.rhs.emit_java(out, pool)
+        out.append(')')
+
+# Java parses 'a op b op c' left-associatively, so this is equivalent to a left-deep chain of BinaryOps
+@dataclass(slots=True, eq=False)
+class NaryOp(Expr):
+    op: str
+    operands: list[Expr]
+    def __post_init__(self):
+        assert len(self.operands) >= 2, self.operands
+    def java_type(self) -> str:
+        if self.op in {'==', '!=', '<', '<=', '>', '>=', '&&', '||', 'instanceof'}:
+            return 'boolean'
+        return JAVA_TYPE_UNKNOWN
+    def visit_children(self, visitor: IRVisitor) -> None:
+        for operand in self.operands:
+            visitor.visit_expr(operand)
+    def transform_children(self, transformer: IRTransformer) -> Expr:
+        self.operands = [transformer.transform_expr(operand) for operand in self.operands]
+        return self
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        sep = f' {self.op} '
+        out.append('(')
+        for (i, operand) in enumerate(self.operands):
+            if i:
+                out.append(sep)
+            operand.emit_java(out, pool)
+        out.append(')')
+
+@dataclass(slots=True, eq=False)
 class CondOp(Expr):
     cond: Expr
     true: Expr
@@ -373,10 +460,16 @@ class CondOp(Expr):
         self.true = transformer.transform_expr(self.true)
         self.false = transformer.transform_expr(self.false)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'({self.cond.emit_java(pool)} ? {self.true.emit_java(pool)} : {self.false.emit_java(pool)})'
-
-@dataclass(slots=True)
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('(')
+        self.cond.emit_java(out, pool)
+        out.append(' ? ')
+        self.true.emit_java(out, pool)
+        out.append(' : ')
+        self.false.emit_java(out, pool)
+        out.append(')')
+
+@dataclass(slots=True, eq=False)
 class CreateObject(Expr):
     type: str
     args: list[Expr]
@@ -388,10 +481,16 @@ class CreateObject(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.args = [transformer.transform_expr(arg) for arg in self.args]
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f"new {self.type}({', '.join(arg.emit_java(pool) for arg in self.args)})"
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'new {self.type}(')
+        emit_java_list(self.args, out, pool)
+        out.append(')')
+
+@functools.cache
+def _create_array_prefix(type: str) -> str:
+    return f'new {type}[] {{'
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class CreateArray(Expr):
     type: str
     elts: list[Expr]
@@ -403,10 +502,23 @@ class CreateArray(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.elts = [transformer.transform_expr(elt) for elt in self.elts]
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f"new {self.type}[] {{{', '.join(x.emit_java(pool) for x in self.elts)}}}"
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(_create_array_prefix(self.type))
+        emit_java_list(self.elts, out, pool)
+        out.append('}')
+
+_SIGNED_BYTE_STRS = [str(((x + 0x80) & 0xFF) - 0x80) for x in range(256)]
 
-@dataclass(slots=True)
+# equivalent to a CreateArray of byte IntLiterals, without building a node per byte
+@dataclass(slots=True, eq=False)
+class ByteArrayLiteral(Expr):
+    value: bytes
+    def java_type(self) -> str:
+        return 'byte[]'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f"new byte[] {{{', '.join([_SIGNED_BYTE_STRS[x] for x in self.value])}}}")
+
+@dataclass(slots=True, eq=False)
 class MethodCall(Expr):
     obj: Expr
     method: str
@@ -422,10 +534,13 @@ class MethodCall(Expr):
         self.obj = transformer.transform_expr(self.obj)
         self.args = [transformer.transform_expr(arg) for arg in self.args]
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f"{self.obj.emit_java(pool)}.{self.method}({', '.join(arg.emit_java(pool) for arg in self.args)})"
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        self.obj.emit_java(out, pool)
+        out.append(f'.{self.method}(')
+        emit_java_list(self.args, out, pool)
+        out.append(')')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class StaticMethodCall(Expr):
     class_name: str
     method: str
@@ -439,17 +554,19 @@ class StaticMethodCall(Expr):
     def transform_children(self, transformer: IRTransformer) -> Expr:
         self.args = [transformer.transform_expr(arg) for arg in self.args]
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f"{self.class_name}.{self.method}({', '.join(arg.emit_java(pool) for arg in self.args)})"
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.class_name}.{self.method}(')
+        emit_java_list(self.args, out, pool)
+        out.append(')')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class MethodRef(Expr):
     obj: str
     method: str
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'{self.obj}::{self.method}'
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(f'{self.obj}::{self.method}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class AssignExpr(Expr):
     lhs: Expr
     rhs: Expr
@@ -465,34 +582,56 @@ class AssignExpr(Expr):
         self.lhs = transformer.transform_expr(self.lhs)
         self.rhs = transformer.transform_expr(self.rhs)
         return self
-    def emit_java(self, pool: ConstantPool) -> str:
-        return f'({self.lhs.emit_java(pool)} = {self.rhs.emit_java(pool)})'
-
-@dataclass(slots=True)
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append('(')
+        self.lhs.emit_java(out, pool)
+        out.append(' = ')
+        self.rhs.emit_java(out, pool)
+        out.append(')')
+
+@dataclass(slots=True, eq=False)
 class PyConstant(Expr):
     value: object
     def java_type(self) -> str:
-        if self.value is None:
-            return 'PyNone'
-        elif self.value is Ellipsis:
-            return 'PyEllipsis'
-        elif self.value is False or self.value is True:
-            return 'PyBool'
-        elif isinstance(self.value, int):
-            return 'PyInt'
-        elif isinstance(self.value, str):
-            return 'PyString'
-        elif isinstance(self.value, float):
-            return 'PyFloat'
-        elif isinstance(self.value, tuple):
-            return 'PyTuple'
-        else:
-            assert isinstance(self.value, bytes), self.value
-            return 'PyBytes'
-    def emit_java(self, pool: ConstantPool) -> str:
-        return pool.emit_constant(self.value)
+        java_type = PY_CONSTANT_JAVA_TYPES.get(type(self.value))
+        assert java_type is not None, self.value
+        return java_type
+    def emit_java(self, out: list[str], pool: ConstantPool) -> None:
+        out.append(pool.emit_constant(self.value))
+
+# Shared instances of stateless leaf nodes; IR leaves are never mutated once built, so these may appear anywhere in a tree
+NULL = Null()
+THIS = This()
+TRUE = Bool(True)
+FALSE = Bool(False)
+
+@functools.cache
+def identifier(name: str, java_type_hint: str = JAVA_TYPE_UNKNOWN) -> Identifier:
+    """Return a shared Identifier node, for names that recur throughout a translation unit."""
+    return Identifier(name, java_type_hint)
+
+@functools.cache
+def str_literal(s: str) -> StrLiteral:
+    """Return a shared StrLiteral node, for attribute and variable names that recur throughout a translation unit."""
+    return StrLiteral(s)
+
+@functools.cache
+def int_literal(value: int, suffix: str = '') -> IntLiteral:
+    """Return a shared IntLiteral node, for small indices and counts."""
+    return IntLiteral(value, suffix)
+
+# typed=True keeps 1 and True apart; floats and tuples are not cached since e.g. 0.0 == -0.0 and (1,) == (True,)
+@functools.lru_cache(maxsize=None, typed=True)
+def py_constant(value: None | types.EllipsisType | bool | int | str | bytes) -> PyConstant:
+    """Return a shared PyConstant node for a literal that recurs in the source."""
+    return PyConstant(value)
+
+# Statements and decls emit whole lines, each prefixed with the indent string of its nesting depth
+INDENT = '    '
 
 class Statement(ABC):
+    __slots__ = ()
+
     def ends_control_flow(self) -> bool:
         return False
 
@@ -503,10 +642,10 @@ class Statement(ABC):
         return self
 
     @abstractmethod
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         raise NotImplementedError()
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class LocalDecl(Statement):
     type: str
     name: str
@@ -518,13 +657,24 @@ class LocalDecl(Statement):
         if self.value is not None:
             self.value = transformer.transform_expr(self.value)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         if self.value is not None:
-            yield f'{self.type} {self.name} = {self.value.emit_java(pool)};'
+            out = [indent, self.type, ' ', self.name, ' = ']
+            self.value.emit_java(out, pool)
+            out.append(';')
+            lines.append(''.join(out))
         else:
-            yield f'{self.type} {self.name};'
+            lines.append(f'{indent}{self.type} {self.name};')
+
+# uninitialized declaration of several locals of one raw type; boxed locals use LocalDecl so that carrier lowering can retype each one
+@dataclass(slots=True, eq=False)
+class MultiLocalDecl(Statement):
+    type: str
+    names: list[str]
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(f"{indent}{self.type} {', '.join(self.names)};")
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class AssignStatement(Statement):
     lhs: Expr
     rhs: Expr
@@ -535,10 +685,15 @@ class AssignStatement(Statement):
         self.lhs = transformer.transform_expr(self.lhs)
         self.rhs = transformer.transform_expr(self.rhs)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'{self.lhs.emit_java(pool)} = {self.rhs.emit_java(pool)};'
-
-@dataclass(slots=True)
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent]
+        self.lhs.emit_java(out, pool)
+        out.append(' = ')
+        self.rhs.emit_java(out, pool)
+        out.append(';')
+        lines.append(''.join(out))
+
+@dataclass(slots=True, eq=False)
 class ExprStatement(Statement):
     call: CreateObject | MethodCall | StaticMethodCall # only limited types of expressions allowed by Java grammar
     def visit_children(self, visitor: IRVisitor) -> None:
@@ -546,10 +701,13 @@ class ExprStatement(Statement):
     def transform_children(self, transformer: IRTransformer) -> Statement:
         self.call = transformer.transform_expr(self.call)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'{self.call.emit_java(pool)};'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent]
+        self.call.emit_java(out, pool)
+        out.append(';')
+        lines.append(''.join(out))
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class SuperConstructorCall(Statement):
     args: list[Expr]
     def visit_children(self, visitor: IRVisitor) -> None:
@@ -558,25 +716,28 @@ class SuperConstructorCall(Statement):
     def transform_children(self, transformer: IRTransformer) -> Statement:
         self.args = [transformer.transform_expr(arg) for arg in self.args]
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f"super({', '.join(arg.emit_java(pool) for arg in self.args)});"
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent, 'super(']
+        emit_java_list(self.args, out, pool)
+        out.append(');')
+        lines.append(''.join(out))
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class BreakStatement(Statement):
     name: Optional[str]
     def ends_control_flow(self) -> bool:
         return True
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'break {self.name};' if self.name else 'break;'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(f'{indent}break {self.name};' if self.name else indent + 'break;')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ContinueStatement(Statement):
     def ends_control_flow(self) -> bool:
         return True
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield 'continue;'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(indent + 'continue;')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ReturnStatement(Statement):
     expr: Optional[Expr] = None
     def ends_control_flow(self) -> bool:
@@ -588,13 +749,16 @@ class ReturnStatement(Statement):
         if self.expr is not None:
             self.expr = transformer.transform_expr(self.expr)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         if self.expr is None:
-            yield 'return;'
+            lines.append(indent + 'return;')
         else:
-            yield f'return {self.expr.emit_java(pool)};'
+            out = [indent, 'return ']
+            self.expr.emit_java(out, pool)
+            out.append(';')
+            lines.append(''.join(out))
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ThrowStatement(Statement):
     expr: Expr
     def ends_control_flow(self) -> bool:
@@ -604,36 +768,40 @@ class ThrowStatement(Statement):
     def transform_children(self, transformer: IRTransformer) -> Statement:
         self.expr = transformer.transform_expr(self.expr)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'throw {self.expr.emit_java(pool)};'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent, 'throw ']
+        self.expr.emit_java(out, pool)
+        out.append(';')
+        lines.append(''.join(out))
 
 def block_simplify(block: list[Statement]) -> list[Statement]:
-    ret = []
-    for s in block:
-        ret.append(s)
+    for (i, s) in enumerate(block):
         if s.ends_control_flow():
-            break
-    return ret
+            return block[:i + 1]
+    return block[:]
 
-def block_emit_java(block: list[Statement], pool: ConstantPool) -> Iterator[str]:
+def block_emit_java(block: list[Statement], lines: list[str], pool: ConstantPool, indent: str) -> None:
     for s in block:
-        yield from s.emit_java(pool)
+        s.emit_java(lines, pool, indent)
 
 def block_ends_control_flow(block: list[Statement]) -> bool:
     return bool(block) and block[-1].ends_control_flow()
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class IfStatement(Statement):
     cond: Expr
     body: list[Statement]
     orelse: list[Statement]
+    terminates: bool = field(init=False, repr=False)
 
+    # ends_control_flow() is cached because enclosing blocks query it repeatedly; transforms rewrite statements 1:1 and cannot change it
     def __post_init__(self):
         self.body = block_simplify(self.body)
         self.orelse = block_simplify(self.orelse)
+        self.terminates = block_ends_control_flow(self.body) and block_ends_control_flow(self.orelse)
 
     def ends_control_flow(self) -> bool:
-        return block_ends_control_flow(self.body) and block_ends_control_flow(self.orelse)
+        return self.terminates
 
     def visit_children(self, visitor: IRVisitor) -> None:
         visitor.visit_expr(self.cond)
@@ -648,23 +816,27 @@ class IfStatement(Statement):
         self.orelse = [transformer.transform_stmt(s) for s in self.orelse]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        inner = indent + INDENT
         node = self
         prefix = ''
         while True:
-            yield f'{prefix}if ({node.cond.emit_java(pool)}) {{'
-            yield from block_emit_java(node.body, pool)
+            out = [indent, prefix, 'if (']
+            node.cond.emit_java(out, pool)
+            out.append(') {')
+            lines.append(''.join(out))
+            block_emit_java(node.body, lines, pool, inner)
             if node.orelse:
                 if len(node.orelse) == 1 and isinstance(node.orelse[0], IfStatement):
                     node = node.orelse[0]
                     prefix = '} else '
                     continue
-                yield '} else {'
-                yield from block_emit_java(node.orelse, pool)
+                lines.append(indent + '} else {')
+                block_emit_java(node.orelse, lines, pool, inner)
             break
-        yield '}'
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class WhileStatement(Statement):
     cond: Expr
     body: list[Statement]
@@ -682,13 +854,16 @@ class WhileStatement(Statement):
         self.body = [transformer.transform_stmt(s) for s in self.body]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'while ({self.cond.emit_java(pool)}) {{'
-        yield from block_emit_java(self.body, pool)
-        yield '}'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent, 'while (']
+        self.cond.emit_java(out, pool)
+        out.append(') {')
+        lines.append(''.join(out))
+        block_emit_java(self.body, lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
 # simplified; init/incr are weird because of semicolons/parens if we try to map them to statement or expr
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ForStatement(Statement):
     init_type: str
     init_name: str
@@ -715,12 +890,19 @@ class ForStatement(Statement):
         self.body = [transformer.transform_stmt(s) for s in self.body]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'for ({self.init_type} {self.init_name} = {self.init_value.emit_java(pool)}; {self.cond.emit_java(pool)}; {self.incr_name} = {self.incr_value.emit_java(pool)}) {{'
-        yield from block_emit_java(self.body, pool)
-        yield '}'
-
-@dataclass(slots=True)
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent, 'for (', self.init_type, ' ', self.init_name, ' = ']
+        self.init_value.emit_java(out, pool)
+        out.append('; ')
+        self.cond.emit_java(out, pool)
+        out += ('; ', self.incr_name, ' = ')
+        self.incr_value.emit_java(out, pool)
+        out.append(') {')
+        lines.append(''.join(out))
+        block_emit_java(self.body, lines, pool, indent + INDENT)
+        lines.append(indent + '}')
+
+@dataclass(slots=True, eq=False)
 class ForEachStatement(Statement):
     var_type: str
     var_name: str
@@ -740,31 +922,37 @@ class ForEachStatement(Statement):
         self.body = [transformer.transform_stmt(s) for s in self.body]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'for ({self.var_type} {self.var_name}: {self.iterable.emit_java(pool)}) {{'
-        yield from block_emit_java(self.body, pool)
-        yield '}'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        out = [indent, 'for (', self.var_type, ' ', self.var_name, ': ']
+        self.iterable.emit_java(out, pool)
+        out.append(') {')
+        lines.append(''.join(out))
+        block_emit_java(self.body, lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class TryStatement(Statement):
     try_body: list[Statement]
     exc_type: Optional[str]
     exc_name: Optional[str]
     catch_body: list[Statement]
     finally_body: list[Statement]
+    terminates: bool = field(init=False, repr=False)
 
+    # cached for the same reason as IfStatement.terminates
     def __post_init__(self):
         self.try_body = block_simplify(self.try_body)
         self.catch_body = block_simplify(self.catch_body)
         self.finally_body = block_simplify(self.finally_body)
-
-    def ends_control_flow(self) -> bool:
         if block_ends_control_flow(self.finally_body):
-            return True
-        if self.exc_type is not None:
-            return block_ends_control_flow(self.try_body) and block_ends_control_flow(self.catch_body)
+            self.terminates = True
+        elif self.exc_type is not None:
+            self.terminates = block_ends_control_flow(self.try_body) and block_ends_control_flow(self.catch_body)
         else:
-            return block_ends_control_flow(self.try_body)
+            self.terminates = block_ends_control_flow(self.try_body)
+
+    def ends_control_flow(self) -> bool:
+        return self.terminates
 
     def visit_children(self, visitor: IRVisitor) -> None:
         for s in self.try_body:
@@ -780,21 +968,22 @@ class TryStatement(Statement):
         self.finally_body = [transformer.transform_stmt(s) for s in self.finally_body]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield 'try {'
-        yield from block_emit_java(self.try_body, pool)
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        inner = indent + INDENT
+        lines.append(indent + 'try {')
+        block_emit_java(self.try_body, lines, pool, inner)
         if self.exc_type is not None:
-            yield f'}} catch ({self.exc_type} {self.exc_name}) {{'
-            yield from block_emit_java(self.catch_body, pool)
+            lines.append(f'{indent}}} catch ({self.exc_type} {self.exc_name}) {{')
+            block_emit_java(self.catch_body, lines, pool, inner)
         else: # if no exception type, should not have an exception name or catch block either
             assert self.exc_name is None, self.exc_name
             assert not self.catch_body, self.catch_body
         if self.finally_body:
-            yield '} finally {'
-            yield from block_emit_java(self.finally_body, pool)
-        yield '}'
+            lines.append(indent + '} finally {')
+            block_emit_java(self.finally_body, lines, pool, inner)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class LabeledBlock(Statement):
     name: str
     body: list[Statement]
@@ -810,17 +999,17 @@ class LabeledBlock(Statement):
         self.body = [transformer.transform_stmt(s) for s in self.body]
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'{self.name}: {{'
-        yield from block_emit_java(self.body, pool)
-        yield '}'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(f'{indent}{self.name}: {{')
+        block_emit_java(self.body, lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class SwitchCase:
     expr: Expr
     value: Expr
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class SwitchStatement(Statement):
     expr: Expr
     cases: list[SwitchCase]
@@ -842,14 +1031,15 @@ class SwitchStatement(Statement):
         self.default = transformer.transform_expr(self.default)
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'switch ({self.expr.emit_java(pool)}) {{'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        inner = indent + INDENT
+        lines.append(f'{indent}switch ({self.expr.emit_java_str(pool)}) {{')
         for case in self.cases:
-            yield f'case {case.expr.emit_java(pool)}: return {case.value.emit_java(pool)};'
-        yield f'default: return {self.default.emit_java(pool)};'
-        yield '}'
+            lines.append(f'{inner}case {case.expr.emit_java_str(pool)}: return {case.value.emit_java_str(pool)};')
+        lines.append(f'{inner}default: return {self.default.emit_java_str(pool)};')
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class SwitchVoidStatement(Statement):
     expr: Expr
     cases: list[SwitchCase]
@@ -871,18 +1061,21 @@ class SwitchVoidStatement(Statement):
         self.default = transformer.transform_expr(self.default)
         return self
 
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f'switch ({self.expr.emit_java(pool)}) {{'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        inner = indent + INDENT
+        lines.append(f'{indent}switch ({self.expr.emit_java_str(pool)}) {{')
         for case in self.cases:
-            yield f'case {case.expr.emit_java(pool)}:'
-            yield f'{case.value.emit_java(pool)};'
-            yield 'return;'
-        yield 'default:'
-        yield f'{self.default.emit_java(pool)};'
-        yield 'return;'
-        yield '}'
+            lines.append(f'{inner}case {case.expr.emit_java_str(pool)}:')
+            lines.append(f'{inner}{case.value.emit_java_str(pool)};')
+            lines.append(inner + 'return;')
+        lines.append(inner + 'default:')
+        lines.append(f'{inner}{self.default.emit_java_str(pool)};')
+        lines.append(inner + 'return;')
+        lines.append(indent + '}')
 
 class Decl(ABC):
+    __slots__ = ()
+
     def visit_children(self, visitor: IRVisitor) -> None:
         pass
 
@@ -890,10 +1083,10 @@ class Decl(ABC):
         return self
 
     @abstractmethod
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         raise NotImplementedError()
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class FieldDecl(Decl):
     modifiers: str
     type: str
@@ -906,13 +1099,16 @@ class FieldDecl(Decl):
         if self.value is not None:
             self.value = transformer.transform_expr(self.value)
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         if self.value is not None:
-            yield f'{self.modifiers} {self.type} {self.name} = {self.value.emit_java(pool)};'
+            out = [indent, self.modifiers, ' ', self.type, ' ', self.name, ' = ']
+            self.value.emit_java(out, pool)
+            out.append(';')
+            lines.append(''.join(out))
         else:
-            yield f'{self.modifiers} {self.type} {self.name};'
+            lines.append(f'{indent}{self.modifiers} {self.type} {self.name};')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class MethodDecl(Decl):
     modifiers: str
     return_type: str
@@ -925,12 +1121,12 @@ class MethodDecl(Decl):
     def transform_children(self, transformer: IRTransformer) -> Decl:
         self.body = [transformer.transform_stmt(stmt) for stmt in self.body]
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield f"{self.modifiers} {self.return_type} {self.name}({', '.join(self.args)}) {{"
-        yield from block_emit_java(block_simplify(self.body), pool)
-        yield '}'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(f"{indent}{self.modifiers} {self.return_type} {self.name}({', '.join(self.args)}) {{")
+        block_emit_java(block_simplify(self.body), lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ConstructorDecl(Decl):
     modifiers: str
     name: str
@@ -942,15 +1138,15 @@ class ConstructorDecl(Decl):
     def transform_children(self, transformer: IRTransformer) -> Decl:
         self.body = [transformer.transform_stmt(stmt) for stmt in self.body]
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         if self.modifiers:
-            yield f"{self.modifiers} {self.name}({', '.join(self.args)}) {{"
+            lines.append(f"{indent}{self.modifiers} {self.name}({', '.join(self.args)}) {{")
         else:
-            yield f"{self.name}({', '.join(self.args)}) {{"
-        yield from block_emit_java(block_simplify(self.body), pool)
-        yield '}'
+            lines.append(f"{indent}{self.name}({', '.join(self.args)}) {{")
+        block_emit_java(block_simplify(self.body), lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class StaticBlock(Decl):
     body: list[Statement]
     def visit_children(self, visitor: IRVisitor) -> None:
@@ -959,29 +1155,37 @@ class StaticBlock(Decl):
     def transform_children(self, transformer: IRTransformer) -> Decl:
         self.body = [transformer.transform_stmt(stmt) for stmt in self.body]
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
-        yield 'static {'
-        yield from block_emit_java(block_simplify(self.body), pool)
-        yield '}'
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
+        lines.append(indent + 'static {')
+        block_emit_java(block_simplify(self.body), lines, pool, indent + INDENT)
+        lines.append(indent + '}')
 
-@dataclass(slots=True)
+@dataclass(slots=True, eq=False)
 class ClassDecl(Decl):
     modifiers: str
     name: str
     extends: Optional[str]
     decls: list[Decl]
+    holds_pool: bool = False # constant pool fields are emitted at the top of this class, once its body has registered them
     def visit_children(self, visitor: IRVisitor) -> None:
         for decl in self.decls:
             visitor.visit_decl(decl)
     def transform_children(self, transformer: IRTransformer) -> Decl:
         self.decls = [transformer.transform_decl(decl) for decl in self.decls]
         return self
-    def emit_java(self, pool: ConstantPool) -> Iterator[str]:
+    def emit_java(self, lines: list[str], pool: ConstantPool, indent: str) -> None:
         extends = f' extends {self.extends}' if self.extends else ''
-        yield f'{self.modifiers} class {self.name}{extends} {{'
+        inner = indent + INDENT
+        lines.append(f'{indent}{self.modifiers} class {self.name}{extends} {{')
+        start = len(lines)
         for decl in self.decls:
-            yield from decl.emit_java(pool)
-        yield '}'
+            decl.emit_java(lines, pool, inner)
+        if self.holds_pool:
+            field_lines: list[str] = []
+            for decl in pool.build_field_decls():
+                decl.emit_java(field_lines, pool, inner)
+            lines[start:start] = field_lines
+        lines.append(indent + '}')
 
 class IRVisitor:
     def visit_expr(self, expr: Expr) -> None:
@@ -1040,7 +1244,7 @@ class LocalCarrierSpec:
             case 'PyInt':
                 return IntLiteral(value, 'L')
             case 'PyBool':
-                return Bool(value)
+                return TRUE if value else FALSE
             case 'PyFloat':
                 if math.isnan(value):
                     return Identifier('Double.NaN', 'double')
@@ -1056,11 +1260,11 @@ class LocalCarrierSpec:
             case 'long':
                 return IntLiteral(0, 'L')
             case 'boolean':
-                return Bool(False)
+                return FALSE
             case 'double':
                 return FloatLiteral(0.0)
             case 'String' | 'byte[]' | 'PyObject[]' | 'java.io.ByteArrayOutputStream' | 'StringBuilder' | 'ArrayList<PyObject>' | 'HashSet<PyObject>' | 'LinkedHashMap<PyObject, PyObject>':
-                return Null()
+                return NULL
         assert False, self.raw_type
 
 ALL_LOCAL_CARRIER_SPECS = {
@@ -1375,14 +1579,14 @@ def lower_local_carrier_locals_in_decl(decl: Decl) -> Decl:
 
 def unary_op(op: str, operand: Expr) -> Expr:
     if op == '!' and isinstance(operand, Bool):
-        return Bool(not operand.value)
+        return FALSE if operand.value else TRUE
     return UnaryOp(op, operand)
 
 def bool_value(expr: Expr) -> Expr:
     if isinstance(expr, StaticMethodCall) and expr.class_name == 'PyBool' and expr.method == 'create':
         return expr.args[0] # return the raw boolean instead of box/unbox
     if isinstance(expr, PyConstant):
-        return Bool(bool(expr.value))
+        return TRUE if expr.value else FALSE
     if expr.java_type() == 'PyBool':
         return Field(expr, 'value', 'boolean')
     return MethodCall(expr, 'boolValue', [], 'boolean')
@@ -1636,10 +1840,9 @@ def static_method_call(class_name: str, method: str, args: list[Expr], return_ty
 
 def chained_binary_op(op: str, exprs: list[Expr]) -> Expr:
     assert len(exprs) >= 1, exprs
-    expr = exprs[0]
-    for term in exprs[1:]:
-        expr = BinaryOp(op, expr, term)
-    return expr
+    if len(exprs) == 1:
+        return exprs[0]
+    return NaryOp(op, list(exprs))
 
 def method_call_statement(obj: Expr, method: str, args: list[Expr]) -> ExprStatement:
     return ExprStatement(MethodCall(obj, method, args))
@@ -1669,19 +1872,29 @@ def while_statement(cond: Expr, body: list[Statement]) -> Iterator[Statement]:
     else:
         yield WhileStatement(cond, body)
 
+class NodeCounter(IRVisitor):
+    def __init__(self):
+        self.count = 0
+
+    def visit_expr(self, expr: Expr) -> None:
+        self.count += 1
+        expr.visit_children(self)
+
+    def visit_stmt(self, stmt: Statement) -> None:
+        self.count += 1
+        stmt.visit_children(self)
+
+# a rough proxy for how much bytecode a list of statements compiles into
+def count_nodes(block: list[Statement]) -> int:
+    counter = NodeCounter()
+    for stmt in block:
+        counter.visit_stmt(stmt)
+    return counter.count
+
 def write_decls(f: TextIO, decls: list[Decl], pool: ConstantPool) -> None:
     decls = lower_decls_for_emission(decls)
+    lines: list[str] = []
     for decl in decls:
-        for _ in decl.emit_java(pool):
-            pass
-    indent = 0
-    for decl in decls:
-        for line in decl.emit_java(pool):
-            if line.startswith('}'):
-                indent -= 1
-            f.write('    ' * indent)
-            f.write(line)
-            f.write('\n')
-            if line.endswith('{'):
-                indent += 1
-    assert indent == 0, indent
+        decl.emit_java(lines, pool, '')
+    lines.append('') # final newline
+    f.write('\n'.join(lines))
@@ -8,6 +8,7 @@ import ast
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
+import functools
 import inspect
 import itertools
 import json
@@ -17,7 +18,7 @@ import subprocess
 import sys
 import tempfile
 import types
-from typing import Iterator, Optional, TextIO, cast
+from typing import Callable, ClassVar, Iterator, Optional, TextIO, cast
 
 import extract_spec
 import ir
@@ -25,6 +26,17 @@ import ir
 # Keep this explicit and narrow; widen it only for builtin types we have actually
 # exercised and are comfortable lowering directly to JVM instanceof checks.
 ISINSTANCE_SINGLE_FASTPATH_BUILTIN_TYPES = {'bool', 'bytearray', 'bytes', 'dict', 'float', 'int', 'object', 'set', 'slice', 'str', 'tuple', 'type'}
+UNARYOP_METHOD_NAMES = {ast.Invert: 'invert', ast.UAdd: 'pos', ast.USub: 'neg'}
+BINOP_METHOD_NAMES = {
+    ast.Add: 'add', ast.BitAnd: 'and', ast.BitOr: 'or', ast.BitXor: 'xor', ast.Div: 'trueDiv', ast.FloorDiv: 'floorDiv', ast.LShift: 'lshift',
+    ast.MatMult: 'matmul', ast.Mod: 'mod', ast.Mult: 'mul', ast.Pow: 'pow', ast.RShift: 'rshift', ast.Sub: 'sub',
+}
+IDENTITY_COMPARE_OPERATORS = {ast.Is: '==', ast.IsNot: '!='}
+COMPARE_METHODS = { # (PyObject method, whether to negate its result)
+    ast.Lt: ('lt', False), ast.LtE: ('le', False), ast.Gt: ('gt', False), ast.GtE: ('ge', False),
+    ast.Eq: ('equals', False), ast.NotEq: ('equals', True), ast.In: ('in', False), ast.NotIn: ('in', True),
+}
+RAW_COMPARE_OPERATORS = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!='}
 EXACT_INT_BINOPS = {'add', 'and', 'floorDiv', 'lshift', 'mod', 'mul', 'or', 'pow', 'rshift', 'sub', 'xor'}
 EXACT_RECEIVER_BINOP_RETURN_JAVA_TYPES = {
     ('PyByteArray', 'add'): 'PyByteArray',
@@ -285,7 +297,37 @@ def collect_builtin_method_exact_return_types(node: ast.Module) -> dict[str, dic
             ret[class_node.name] = method_types
     return ret
 
-class AstSimplifier(ast.NodeTransformer):
+class TableDispatchVisitor(ast.NodeVisitor):
+    """NodeVisitor that dispatches through a per-class table of visit_* methods, rather than a string build and getattr per node."""
+    __slots__ = ()
+    visit_dispatch: ClassVar[dict[type, Callable]]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.visit_dispatch = {}
+        for name in dir(cls):
+            if name.startswith('visit_'):
+                node_type = getattr(ast, name.removeprefix('visit_'), None)
+                if isinstance(node_type, type) and issubclass(node_type, ast.AST):
+                    cls.visit_dispatch[node_type] = getattr(cls, name)
+
+    def visit(self, node):
+        method = self.visit_dispatch.get(type(node))
+        if method is None:
+            return self.generic_visit(node)
+        return method(self, node)
+
+    # statement visitors return None, so a block can be dispatched from one local table lookup per node
+    def visit_statements(self, statements: list[ast.stmt]) -> None:
+        dispatch = self.visit_dispatch
+        for statement in statements:
+            method = dispatch.get(type(statement))
+            if method is None:
+                self.generic_visit(statement)
+            else:
+                method(self, statement)
+
+class AstSimplifier(TableDispatchVisitor, ast.NodeTransformer):
     def _is_inert_literal_expr(self, node: ast.expr) -> bool:
         match node:
             case ast.Constant():
@@ -814,7 +856,7 @@ def _infer_subscript_exact_builtin_type(node: ast.Subscript) -> Optional[str]:
             return value_type
     return None
 
-class ScopeAnalyzer(ast.NodeVisitor):
+class ScopeAnalyzer(TableDispatchVisitor):
     __slots__ = ('scope_infos', 'preserved_scope_infos', 'module_locals', 'metadata', 'enable_exact_type_inference')
     scope_infos: dict[ast.AST, ScopeInfo]
     preserved_scope_infos: dict[ast.AST, ScopeInfo]
@@ -1373,17 +1415,43 @@ class Scope:
 
     def make_temp(self) -> str:
         """Assign and return a new temporary variable name."""
-        temp_name = f'temp{self.n_temps}'
+        name = temp_var_name(self.n_temps)
         self.n_temps += 1
-        return temp_name
+        return name
+
+    def make_temps(self, count: int) -> list[str]:
+        """Assign and return count new consecutive temporary variable names."""
+        start = self.n_temps
+        self.n_temps = start + count
+        return [temp_var_name(n) for n in range(start, start + count)]
 
 # XXX Need to design a systematic way to avoid "code too large" and "too many constants" errors.
 # This is somewhat challenging, as even a single Python expression or statement can easily overflow
 # the maximum code size limit, and it is somewhat unpredictable how much bytecode our translations
 # will compile into.  Partial mitigations are likely to be easier than a total fix.
 # XXX "invokedynamic" might help us a lot, but there is no way to access it from Java source
-class LoweringVisitor(ast.NodeVisitor):
-    __slots__ = ('path', 'n_errors', 'n_functions', 'n_lambdas', 'scope', 'global_code', 'code',
+# For now, module-level code is split across helper methods at top-level statement boundaries, to keep each one
+# smaller (HotSpot will not JIT methods over 8000 bytes of bytecode).  Functions are not split.  The limit is counted
+# in IR nodes and is an uncalibrated heuristic: it has not been checked against the bytecode size of the chunks.
+MAX_MODULE_CHUNK_NODES = 2000
+# Java names for Python locals/globals are requested once per name reference; build each only once
+@functools.cache
+def pylocal_name(name: str) -> str:
+    return f'pylocal_{name}'
+
+@functools.cache
+def pyglobal_name(name: str) -> str:
+    return f'pyglobal_{name}'
+
+# every function numbers its temps from 0, so the same few names recur throughout a translation
+@functools.cache
+def temp_var_name(n: int) -> str:
+    return f'temp{n}'
+
+SUPPORTED_CONSTANT_TYPES = frozenset({types.NoneType, types.EllipsisType, bool, int, float, str, bytes})
+
+class LoweringVisitor(TableDispatchVisitor):
+    __slots__ = ('path', 'n_errors', 'n_functions', 'n_lambdas', 'scope', 'global_code', 'global_code_ends', 'code',
                  'scope_infos', 'pool', 'break_name', 'classes', 'allow_intrinsics',
                  'metadata', 'python_helper_names', 'python_helper_class', 'python_helper_return_java_types',
                  'final_global_function_classes')
@@ -1393,6 +1461,7 @@ class LoweringVisitor(ast.NodeVisitor):
     n_lambdas: int
     scope: Scope
     global_code: list[ir.Statement]
+    global_code_ends: list[tuple[int, bool]] # (end index in global_code, whether it uses expr_discard) for each top-level statement
     code: list[ir.Statement]
     scope_infos: dict[ast.AST, ScopeInfo]
     pool: ir.ConstantPool
@@ -1411,7 +1480,8 @@ class LoweringVisitor(ast.NodeVisitor):
         self.n_functions = 0
         self.n_lambdas = 0
         self.scope = Scope(None, module_info)
-        self.global_code = [ir.LocalDecl('PyObject', 'expr_discard', None)] # XXX remove this variable if not needed
+        self.global_code = []
+        self.global_code_ends = []
         self.code = self.global_code
         self.scope_infos = scope_infos
         self.pool = ir.ConstantPool()
@@ -1434,29 +1504,29 @@ class LoweringVisitor(ast.NodeVisitor):
 
     def ident_expr_by_resolution(self, name: str, resolution: NameResolution) -> ir.Expr:
         if self.allow_intrinsics and name == '__pythonj_null__':
-            return ir.Null()
+            return ir.NULL
         if resolution is NameResolution.CELL:
             return ir.Field(self.cell_expr(name), 'obj', 'PyObject')
         if resolution is NameResolution.LOCAL:
             local_java_type = self.java_local_type(name)
             if self.scope.locals_are_fields:
-                return ir.Field(ir.This(), f'pylocal_{name}', local_java_type)
-            return ir.Identifier(f'pylocal_{name}', local_java_type)
+                return ir.Field(ir.THIS, pylocal_name(name), local_java_type)
+            return ir.identifier(pylocal_name(name), local_java_type)
         if resolution is NameResolution.GLOBAL:
             module_name = self.module_scope().info.initial_builtin_module_locals.get(name)
             if module_name is not None:
                 return ir.PyBuiltinModule(module_name, extract_spec.BUILTIN_MODULES[module_name])
             if (type_name := self.global_exact_builtin_type(name)) is not None:
-                return ir.Identifier(f'pyglobal_{name}', extract_spec.BUILTIN_TYPES[type_name])
+                return ir.identifier(pyglobal_name(name), extract_spec.BUILTIN_TYPES[type_name])
         if (type_name := self.module_scope().info.initial_final_constant_types.get(name)) is not None:
-            return ir.Identifier(f'pyglobal_{name}', extract_spec.BUILTIN_TYPES[type_name])
-        return ir.Identifier(f'pyglobal_{name}')
+            return ir.identifier(pyglobal_name(name), extract_spec.BUILTIN_TYPES[type_name])
+        return ir.identifier(pyglobal_name(name))
 
     def builtin_expr(self, name: str) -> Optional[ir.Expr]:
         if name == 'Ellipsis':
-            return ir.Field(ir.Identifier('PyEllipsis'), 'singleton', 'PyEllipsis')
+            return ir.Field(ir.identifier('PyEllipsis'), 'singleton', 'PyEllipsis')
         if name == 'NotImplemented':
-            return ir.Field(ir.Identifier('PyNotImplemented'), 'singleton', 'PyNotImplemented')
+            return ir.Field(ir.identifier('PyNotImplemented'), 'singleton', 'PyNotImplemented')
         if name in extract_spec.BUILTIN_TYPES:
             return ir.PyBuiltinType(name, extract_spec.BUILTIN_TYPES[name])
         if name in extract_spec.EXCEPTION_TYPES:
@@ -1470,20 +1540,20 @@ class LoweringVisitor(ast.NodeVisitor):
 
     def load_expr(self, name: str, resolution: NameResolution, binding_state: Optional[NameBindingState]) -> ir.Expr:
         if self.allow_intrinsics and name == '__pythonj_null__':
-            return ir.Null()
+            return ir.NULL
         if resolution is NameResolution.CELL:
             method = 'getLocal' if name in self.scope.info.cell_vars else 'get'
-            return ir.MethodCall(self.cell_expr(name), method, [ir.StrLiteral(name)], 'PyObject')
+            return ir.MethodCall(self.cell_expr(name), method, [ir.str_literal(name)], 'PyObject')
         if resolution is NameResolution.LOCAL:
             value = self.ident_expr_by_resolution(name, resolution)
             if binding_state is NameBindingState.DEFINITELY_BOUND:
                 return value
-            ret = ir.StaticMethodCall('Runtime', 'getLocal', [value, ir.StrLiteral(name)], 'PyObject')
+            ret = ir.StaticMethodCall('Runtime', 'getLocal', [value, ir.str_literal(name)], 'PyObject')
             return ir.CastExpr(value.java_type(), ret) if value.java_type() != 'PyObject' else ret
 
         assert resolution is NameResolution.GLOBAL, resolution
         if (type_name := self.module_scope().info.initial_final_constant_types.get(name)) is not None:
-            return ir.Identifier(f'pyglobal_{name}', extract_spec.BUILTIN_TYPES[type_name])
+            return ir.identifier(pyglobal_name(name), extract_spec.BUILTIN_TYPES[type_name])
         if name in self.final_global_function_classes:
             return self.ident_expr_by_resolution(name, resolution)
         if name in self.module_scope().info.initial_builtin_module_locals:
@@ -1497,15 +1567,15 @@ class LoweringVisitor(ast.NodeVisitor):
                 return self.ident_expr_by_resolution(name, resolution)
             if builtin is not None:
                 return builtin
-            return ir.StaticMethodCall('Runtime', 'getGlobal', [ir.Null(), ir.StrLiteral(name), ir.Null()], 'PyObject')
+            return ir.StaticMethodCall('Runtime', 'getGlobal', [ir.NULL, ir.str_literal(name), ir.NULL], 'PyObject')
         if binding_state is NameBindingState.DEFINITELY_BOUND:
             return self.ident_expr_by_resolution(name, resolution)
         if self.scope.info.kind is ScopeKind.MODULE and binding_state is NameBindingState.DEFINITELY_UNBOUND and builtin is not None:
             return builtin
         ret = ir.StaticMethodCall('Runtime', 'getGlobal', [
             self.ident_expr_by_resolution(name, resolution),
-            ir.StrLiteral(name),
-            builtin if builtin is not None else ir.Null(),
+            ir.str_literal(name),
+            builtin if builtin is not None else ir.NULL,
         ], 'PyObject')
         if (type_name := self.global_exact_builtin_type(name)) is not None:
             return ir.CastExpr(extract_spec.BUILTIN_TYPES[type_name], ret)
@@ -1622,7 +1692,7 @@ class LoweringVisitor(ast.NodeVisitor):
         return not node.keywords and not any(isinstance(arg, ast.Starred) for arg in node.args)
 
     def emit_plain_positional_args(self, args: list[ast.expr], max_args: int) -> list[ir.Expr]:
-        return [*([self.visit(arg) for arg in args]), *([ir.Null()] * (max_args - len(args)))]
+        return [*([self.visit(arg) for arg in args]), *([ir.NULL] * (max_args - len(args)))]
 
     def expr_exact_java_type(self, node: ast.expr) -> str:
         if (type_name := get_expr_exact_builtin_type(node)) is None:
@@ -1774,33 +1844,17 @@ class LoweringVisitor(ast.NodeVisitor):
         """Print an error for all unknown constructs in translation."""
         self.error(getattr(node, 'lineno', None), f'unsupported Python construct: {type(node).__name__}')
         if isinstance(node, ast.expr):
-            return ir.Identifier('__cannot_translate_expr__') # return placeholder ir.Expr
+            return ir.identifier('__cannot_translate_expr__') # return placeholder ir.Expr
 
-    def visit_Invert(self, node): return 'invert'
-    def visit_UAdd(self, node): return 'pos'
-    def visit_USub(self, node): return 'neg'
     def visit_UnaryOp(self, node) -> ir.Expr:
         if isinstance(node.op, ast.Not):
             return ir.static_method_call('PyBool', 'create', [ir.unary_op('!', self.emit_condition(node.operand))])
-        op = self.visit(node.op)
+        op = UNARYOP_METHOD_NAMES[type(node.op)]
         operand = self.visit(node.operand)
         return ir.MethodCall(operand, op, [])
 
-    def visit_Add(self, node): return 'add'
-    def visit_BitAnd(self, node): return 'and'
-    def visit_BitOr(self, node): return 'or'
-    def visit_BitXor(self, node): return 'xor'
-    def visit_Div(self, node): return 'trueDiv'
-    def visit_FloorDiv(self, node): return 'floorDiv'
-    def visit_LShift(self, node): return 'lshift'
-    def visit_MatMult(self, node): return 'matmul'
-    def visit_Mod(self, node): return 'mod'
-    def visit_Mult(self, node): return 'mul'
-    def visit_Pow(self, node): return 'pow'
-    def visit_RShift(self, node): return 'rshift'
-    def visit_Sub(self, node): return 'sub'
     def visit_BinOp(self, node) -> ir.Expr:
-        op = self.visit(node.op)
+        op = BINOP_METHOD_NAMES[type(node.op)]
         lhs = self.visit(node.left)
         rhs = self.visit(node.right)
         exact_binop_expr = self.emit_exact_type_binop(op, lhs, rhs)
@@ -1817,10 +1871,6 @@ class LoweringVisitor(ast.NodeVisitor):
             return call
         return ir.CastExpr(result_java_type, call)
 
-    def visit_Lt(self, node): return 'lt'
-    def visit_LtE(self, node): return 'le'
-    def visit_Gt(self, node): return 'gt'
-    def visit_GtE(self, node): return 'ge'
     def visit_Compare(self, node) -> ir.Expr:
         n_compares = len(node.comparators)
         assert n_compares == len(node.ops), node # should have consistent number of these
@@ -1829,29 +1879,23 @@ class LoweringVisitor(ast.NodeVisitor):
         comparator_exprs = [self.visit(comparator) for comparator in node.comparators]
         exact_compare_type = self.exact_builtin_type_of_expr(lhs_expr)
         if (exact_compare_type in {'int', 'float'} and
-            all(isinstance(op, (ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)) for op in node.ops) and
+            all(type(op) in RAW_COMPARE_OPERATORS for op in node.ops) and
             all(self.exact_builtin_type_of_expr(expr) == exact_compare_type for expr in comparator_exprs)):
             exprs: list[ir.Expr] = []
             unbox = ir.unbox_int if exact_compare_type == 'int' else ir.unbox_float
             raw_java_type = 'long' if exact_compare_type == 'int' else 'double'
             lhs_unboxed = unbox(lhs_expr)
+            temp_names = self.scope.make_temps(n_compares - 1)
+            if temp_names:
+                self.code.append(ir.MultiLocalDecl(raw_java_type, temp_names))
             for (i, (op, rhs_expr)) in enumerate(zip(node.ops, comparator_exprs)):
                 rhs_unboxed = unbox(rhs_expr)
                 if i < n_compares - 1:
-                    temp_name = self.scope.make_temp()
-                    temp = ir.Identifier(temp_name, raw_java_type)
-                    self.code.append(ir.LocalDecl(raw_java_type, temp_name, None))
-                    rhs_unboxed = ir.AssignExpr(temp, rhs_unboxed)
-                exprs.append(ir.BinaryOp({
-                    ast.Lt: '<',
-                    ast.LtE: '<=',
-                    ast.Gt: '>',
-                    ast.GtE: '>=',
-                    ast.Eq: '==',
-                    ast.NotEq: '!=',
-                }[type(op)], lhs_unboxed, rhs_unboxed))
+                    temp_name = temp_names[i]
+                    rhs_unboxed = ir.AssignExpr(ir.identifier(temp_name, raw_java_type), rhs_unboxed)
+                exprs.append(ir.BinaryOp(RAW_COMPARE_OPERATORS[type(op)], lhs_unboxed, rhs_unboxed))
                 if i < n_compares - 1:
-                    lhs_unboxed = ir.Identifier(temp_name, raw_java_type)
+                    lhs_unboxed = ir.identifier(temp_name, raw_java_type)
             return ir.static_method_call('PyBool', 'create', [ir.chained_binary_op('&&', exprs)])
         if (n_compares == 1 and exact_compare_type == 'str' and
             isinstance(node.ops[0], (ast.Eq, ast.NotEq)) and
@@ -1869,42 +1913,42 @@ class LoweringVisitor(ast.NodeVisitor):
             if i < n_compares - 1:
                 temp_name = self.scope.make_temp()
                 self.code.append(ir.LocalDecl('PyObject', temp_name, None))
-                rhs = ir.AssignExpr(ir.Identifier(temp_name), rhs)
+                rhs = ir.AssignExpr(ir.identifier(temp_name), rhs)
             else:
                 temp_name = '__unused__'
-            if isinstance(op, ast.Is):
-                term = ir.BinaryOp('==', lhs, rhs)
-            elif isinstance(op, ast.IsNot):
-                term = ir.BinaryOp('!=', lhs, rhs)
-            elif isinstance(op, ast.In):
-                term = ir.MethodCall(lhs, 'in', [rhs], 'boolean')
-            elif isinstance(op, ast.NotIn):
-                term = ir.unary_op('!', ir.MethodCall(lhs, 'in', [rhs], 'boolean'))
-            elif isinstance(op, ast.Eq):
-                term = ir.MethodCall(lhs, 'equals', [rhs], 'boolean')
-            elif isinstance(op, ast.NotEq):
-                term = ir.unary_op('!', ir.MethodCall(lhs, 'equals', [rhs], 'boolean'))
+            identity_operator = IDENTITY_COMPARE_OPERATORS.get(type(op))
+            if identity_operator is not None:
+                term = ir.BinaryOp(identity_operator, lhs, rhs)
             else:
-                term = ir.MethodCall(lhs, self.visit(op), [rhs], 'boolean')
+                (method, negate) = COMPARE_METHODS[type(op)]
+                term = ir.MethodCall(lhs, method, [rhs], 'boolean')
+                if negate:
+                    term = ir.unary_op('!', term)
             exprs.append(term)
             if i < n_compares - 1:
-                lhs = ir.Identifier(temp_name)
+                lhs = ir.identifier(temp_name)
         return ir.static_method_call('PyBool', 'create', [ir.chained_binary_op('&&', exprs)])
 
     def emit_bool_op(self, op: ast.boolop, values: list[ast.expr]) -> ir.Expr:
-        if len(values) == 1:
-            return self.visit(values[0])
-        temp_name = self.scope.make_temp()
-        lhs = self.visit(values[0])
-        if (temp_java_type := lhs.java_type()) == ir.JAVA_TYPE_UNKNOWN:
-            temp_java_type = 'PyObject'
-        self.code.append(ir.LocalDecl(temp_java_type, temp_name, None))
-        rhs = self.emit_bool_op(op, values[1:])
-        if isinstance(op, ast.And):
-            return ir.CondOp(ir.bool_value(ir.AssignExpr(ir.Identifier(temp_name), lhs)), rhs, ir.Identifier(temp_name))
-        else:
-            assert isinstance(op, ast.Or), op
-            return ir.CondOp(ir.bool_value(ir.AssignExpr(ir.Identifier(temp_name), lhs)), ir.Identifier(temp_name), rhs)
+        is_and = isinstance(op, ast.And)
+        assert is_and or isinstance(op, ast.Or), op
+        # operands are visited left to right, then the CondOps are nested from the right
+        lhs_terms: list[tuple[str, ir.Expr]] = []
+        for value in values[:-1]:
+            temp_name = self.scope.make_temp()
+            lhs = self.visit(value)
+            if (temp_java_type := lhs.java_type()) == ir.JAVA_TYPE_UNKNOWN:
+                temp_java_type = 'PyObject'
+            self.code.append(ir.LocalDecl(temp_java_type, temp_name, None))
+            lhs_terms.append((temp_name, lhs))
+        expr = self.visit(values[-1])
+        for (temp_name, lhs) in reversed(lhs_terms):
+            cond = ir.bool_value(ir.AssignExpr(ir.identifier(temp_name), lhs))
+            if is_and:
+                expr = ir.CondOp(cond, expr, ir.identifier(temp_name))
+            else:
+                expr = ir.CondOp(cond, ir.identifier(temp_name), expr)
+        return expr
 
     def visit_BoolOp(self, node) -> ir.Expr:
         assert len(node.values) >= 2, node
@@ -1929,7 +1973,7 @@ class LoweringVisitor(ast.NodeVisitor):
             ])
         if isinstance(class_or_tuple, ast.Tuple):
             if not class_or_tuple.elts:
-                return ir.PyConstant(False)
+                return ir.py_constant(False)
             return ir.static_method_call('PyBool', 'create', [
                 ir.chained_binary_op('||', [ir.bool_value(self.emit_isinstance_condition(obj, elt)) for elt in class_or_tuple.elts])
             ])
@@ -1944,20 +1988,23 @@ class LoweringVisitor(ast.NodeVisitor):
         return ir.static_method_call('Runtime', method_name, [self.visit(arg) for arg in args])
 
     def visit_Constant(self, node) -> ir.Expr:
-        if node.value is Ellipsis or isinstance(node.value, (types.NoneType, bool, int, float, str, bytes)):
+        value_type = type(node.value)
+        if value_type is float:
             return ir.PyConstant(node.value)
+        if value_type in SUPPORTED_CONSTANT_TYPES:
+            return ir.py_constant(node.value)
         else:
             self.error(node.lineno, f'literal {node.value!r} of type {type(node.value).__name__!r} is unsupported')
-            return ir.Identifier('__cannot_translate_constant__')
+            return ir.identifier('__cannot_translate_constant__')
 
     def visit_JoinedStr(self, node) -> ir.Expr:
         if not node.values:
-            return ir.PyConstant('')
+            return ir.py_constant('')
         vals: list[ir.Expr] = []
         for val in node.values:
             if isinstance(val, ast.Constant):
                 assert isinstance(val.value, str), val
-                vals.append(ir.StrLiteral(val.value))
+                vals.append(ir.str_literal(val.value))
             else:
                 assert isinstance(val, ast.FormattedValue), val
                 # XXX Need to double check evaluation order here
@@ -1965,7 +2012,7 @@ class LoweringVisitor(ast.NodeVisitor):
                     assert isinstance(val.format_spec, ast.JoinedStr), val.format_spec
                     format_spec = self.visit(val.format_spec)
                 else:
-                    format_spec = ir.PyConstant('')
+                    format_spec = ir.py_constant('')
                 expr = self.visit(val.value)
                 if val.conversion == ord('s'):
                     expr = ir.CreateObject('PyString', [ir.MethodCall(expr, 'str', [], 'String')])
@@ -2009,8 +2056,11 @@ class LoweringVisitor(ast.NodeVisitor):
 
     def visit_Dict(self, node) -> ir.Expr:
         assert len(node.keys) == len(node.values), node
-        kv_iter = itertools.chain.from_iterable(zip(node.keys, node.values))
-        return ir.CreateObject('PyDict', [ir.Null() if x is None else self.visit(x) for x in kv_iter])
+        args: list[ir.Expr] = []
+        for (key, value) in zip(node.keys, node.values):
+            args.append(ir.NULL if key is None else self.visit(key)) # None key means **mapping
+            args.append(self.visit(value))
+        return ir.CreateObject('PyDict', args)
 
     def visit_Call(self, node) -> ir.Expr:
         if (exception := self.emit_builtin_exception_call(node)) is not None:
@@ -2087,15 +2137,14 @@ class LoweringVisitor(ast.NodeVisitor):
             kv_list: list[ir.Expr] = []
             for kwarg in node.keywords:
                 if kwarg.arg is None: # **kwargs
-                    kv_list.append(ir.Null())
-                    kv_list.append(self.visit(kwarg.value))
+                    kv_list.append(ir.NULL)
                 else:
                     assert isinstance(kwarg.arg, str), kwarg.arg
-                    kv_list.append(ir.PyConstant(kwarg.arg))
-                    kv_list.append(self.visit(kwarg.value))
+                    kv_list.append(ir.py_constant(kwarg.arg)) # keyword names recur across call sites
+                kv_list.append(self.visit(kwarg.value))
             kwargs = ir.StaticMethodCall('Runtime', 'requireKwStrings', [ir.CreateObject('PyDict', kv_list)])
         else:
-            kwargs = ir.Null()
+            kwargs = ir.NULL
         return ir.MethodCall(func, 'call', [args, kwargs])
 
     def emit_builtin_exception_call(self, node: ast.Call) -> Optional[ir.Expr]:
@@ -2137,7 +2186,7 @@ class LoweringVisitor(ast.NodeVisitor):
             return direct_expr
         if (direct_expr := self.direct_builtin_type_attr_expr(value, attr, type_name)) is not None:
             return direct_expr
-        return ir.MethodCall(value, 'getAttr', [ir.StrLiteral(attr)])
+        return ir.MethodCall(value, 'getAttr', [ir.str_literal(attr)])
 
     def visit_Attribute(self, node) -> ir.Expr:
         return self.emit_attribute(self.visit(node.value), node.attr, get_expr_exact_builtin_type(node.value))
@@ -2154,7 +2203,7 @@ class LoweringVisitor(ast.NodeVisitor):
             value = ir.PyBuiltinModule(alias.name, extract_spec.BUILTIN_MODULES[alias.name])
             if self.scope.info.initial_builtin_module_locals.get(bind_name) == alias.name:
                 if self.scope.info.kind is ScopeKind.FUNCTION:
-                    self.code.append(ir.LocalDecl('final PyObject', f'pylocal_{bind_name}', value))
+                    self.code.append(ir.LocalDecl('final PyObject', pylocal_name(bind_name), value))
                 else:
                     assert self.scope.info.kind is ScopeKind.MODULE, self.scope.info.kind
                 continue
@@ -2164,9 +2213,9 @@ class LoweringVisitor(ast.NodeVisitor):
         self.error(node.lineno, 'from ... import ... is unsupported')
 
     def visit_Slice(self, node) -> ir.Expr:
-        lower = self.visit(node.lower) if node.lower else ir.PyConstant(None)
-        upper = self.visit(node.upper) if node.upper else ir.PyConstant(None)
-        step = self.visit(node.step) if node.step else ir.PyConstant(None)
+        lower = self.visit(node.lower) if node.lower else ir.py_constant(None)
+        upper = self.visit(node.upper) if node.upper else ir.py_constant(None)
+        step = self.visit(node.step) if node.step else ir.py_constant(None)
         return ir.CreateObject('PySlice', [lower, upper, step])
 
     # XXX Change all statements to -> Iterator[ir.Statement] and yield statements?
@@ -2186,16 +2235,16 @@ class LoweringVisitor(ast.NodeVisitor):
             yield ir.AssignStatement(self.visit(target), value)
         elif isinstance(target, ast.Attribute):
             yield ir.LocalDecl('var', temp_name := self.scope.make_temp(), value)
-            yield ir.method_call_statement(self.visit(target.value), 'setAttr', [ir.StrLiteral(target.attr), ir.Identifier(temp_name)])
+            yield ir.method_call_statement(self.visit(target.value), 'setAttr', [ir.str_literal(target.attr), ir.identifier(temp_name)])
         elif isinstance(target, ast.Subscript):
             yield ir.LocalDecl('var', temp_name := self.scope.make_temp(), value)
-            yield ir.method_call_statement(self.visit(target.value), 'setItem', [self.visit(target.slice), ir.Identifier(temp_name)])
+            yield ir.method_call_statement(self.visit(target.value), 'setItem', [self.visit(target.slice), ir.identifier(temp_name)])
         elif isinstance(target, (ast.Tuple, ast.List)):
             unpack_method = 'unpackSequenceTuple' if value.java_type() == 'PyTuple' else 'unpackSequence'
-            value = ir.StaticMethodCall('Runtime', unpack_method, [value, ir.IntLiteral(len(target.elts))])
+            value = ir.StaticMethodCall('Runtime', unpack_method, [value, ir.int_literal(len(target.elts))])
             yield ir.LocalDecl('var', temp_name := self.scope.make_temp(), value)
             for (i, subtarget) in enumerate(target.elts):
-                yield from self.emit_bind(subtarget, ir.ArrayAccess(ir.Identifier(temp_name), ir.IntLiteral(i)))
+                yield from self.emit_bind(subtarget, ir.ArrayAccess(ir.identifier(temp_name), ir.int_literal(i)))
         else:
             self.error(target.lineno, f'binding to {type(target).__name__} is unsupported')
 
@@ -2213,55 +2262,56 @@ class LoweringVisitor(ast.NodeVisitor):
         assert False, 'AnnAssign should have been removed by AstSimplifier'
 
     def visit_AugAssign(self, node) -> None:
-        base_op = self.visit(node.op)
+        base_op = BINOP_METHOD_NAMES[type(node.op)]
         op = f'{base_op}InPlace'
 
-        if isinstance(node.target, ast.Name):
-            binding_state = get_name_binding_state(node.target) if hasattr(node.target, BINDING_STATE_ATTR) else None
-            lhs = self.load_expr(node.target.id, get_name_resolution(node.target), binding_state)
+        target = node.target
+        if isinstance(target, ast.Name):
+            binding_state = get_name_binding_state(target) if hasattr(target, BINDING_STATE_ATTR) else None
+            resolution = get_name_resolution(target)
+            lhs = self.load_expr(target.id, resolution, binding_state)
             rhs = self.visit(node.value)
             exact_expr = self.emit_exact_type_binop(base_op, lhs, rhs)
             if exact_expr is not None:
                 value = exact_expr
             else:
                 value = ir.MethodCall(lhs, op, [rhs])
-            resolution = get_name_resolution(node.target)
-            value = self.cast_assignment(node.target.id, resolution, value)
-            code = ir.AssignStatement(self.ident_expr_by_resolution(node.target.id, resolution), value)
-        elif isinstance(node.target, ast.Attribute):
-            self.code.append(ir.LocalDecl('var', temp_name := self.scope.make_temp(), self.visit(node.target.value)))
-            code = ir.method_call_statement(ir.Identifier(temp_name), 'setAttr', [
-                ir.StrLiteral(node.target.attr),
+            value = self.cast_assignment(target.id, resolution, value)
+            code = ir.AssignStatement(self.ident_expr_by_resolution(target.id, resolution), value)
+        elif isinstance(target, ast.Attribute):
+            self.code.append(ir.LocalDecl('var', temp_name := self.scope.make_temp(), self.visit(target.value)))
+            code = ir.method_call_statement(ir.identifier(temp_name), 'setAttr', [
+                ir.str_literal(target.attr),
                 ir.MethodCall(
-                    ir.MethodCall(ir.Identifier(temp_name), 'getAttr', [ir.StrLiteral(node.target.attr)]),
+                    ir.MethodCall(ir.identifier(temp_name), 'getAttr', [ir.str_literal(target.attr)]),
                     op,
                     [self.visit(node.value)]
                 )
             ])
-        elif isinstance(node.target, ast.Subscript):
-            self.code.append(ir.LocalDecl('var', temp_name0 := self.scope.make_temp(), self.visit(node.target.value)))
-            self.code.append(ir.LocalDecl('var', temp_name1 := self.scope.make_temp(), self.visit(node.target.slice)))
-            code = ir.method_call_statement(ir.Identifier(temp_name0), 'setItem', [
-                ir.Identifier(temp_name1),
+        elif isinstance(target, ast.Subscript):
+            self.code.append(ir.LocalDecl('var', temp_name0 := self.scope.make_temp(), self.visit(target.value)))
+            self.code.append(ir.LocalDecl('var', temp_name1 := self.scope.make_temp(), self.visit(target.slice)))
+            code = ir.method_call_statement(ir.identifier(temp_name0), 'setItem', [
+                ir.identifier(temp_name1),
                 ir.MethodCall(
-                    ir.MethodCall(ir.Identifier(temp_name0), 'getItem', [ir.Identifier(temp_name1)]),
+                    ir.MethodCall(ir.identifier(temp_name0), 'getItem', [ir.identifier(temp_name1)]),
                     op,
                     [self.visit(node.value)]
                 )
             ])
         else:
-            self.error(node.lineno, f'augmented assignment to {type(node.target).__name__} is unsupported')
+            self.error(node.lineno, f'augmented assignment to {type(target).__name__} is unsupported')
             self.visit(node.value) # recurse to find more errors
             return
         self.code.append(code)
 
     def visit_Assert(self, node) -> None:
         assert isinstance(node.test, ast.Constant) and node.test.value is False, 'Assert should have been normalized by AstSimplifier'
-        msg = ir.StrLiteral(self.path + f':{node.lineno}: assertion failure')
+        msg = self.path + f':{node.lineno}: assertion failure'
+        msg_expr: ir.Expr = ir.str_literal(msg)
         if node.msg:
-            msg.s += ': '
-            msg = ir.BinaryOp('+', msg, ir.MethodCall(self.visit(node.msg), 'repr', []))
-        exception = ir.CreateObject('PyRaise', [ir.CreateObject('PyAssertionError', [ir.CreateObject('PyString', [msg])])])
+            msg_expr = ir.BinaryOp('+', ir.str_literal(msg + ': '), ir.MethodCall(self.visit(node.msg), 'repr', []))
+        exception = ir.CreateObject('PyRaise', [ir.CreateObject('PyAssertionError', [ir.CreateObject('PyString', [msg_expr])])])
         self.code.append(ir.ThrowStatement(exception))
 
     def visit_Delete(self, node) -> None:
@@ -2270,22 +2320,22 @@ class LoweringVisitor(ast.NodeVisitor):
                 resolution = get_name_resolution(target)
                 if resolution is NameResolution.CELL:
                     method = 'deleteLocal' if target.id in self.scope.info.cell_vars else 'delete'
-                    code = ir.method_call_statement(self.cell_expr(target.id), method, [ir.StrLiteral(target.id)])
+                    code = ir.method_call_statement(self.cell_expr(target.id), method, [ir.str_literal(target.id)])
                 elif resolution is NameResolution.LOCAL:
                     storage = self.ident_expr_by_resolution(target.id, resolution)
                     code = ir.AssignStatement(
                         storage,
-                        ir.CastExpr(storage.java_type(), ir.StaticMethodCall('Runtime', 'delLocal', [storage, ir.StrLiteral(target.id)], 'PyObject')),
+                        ir.CastExpr(storage.java_type(), ir.StaticMethodCall('Runtime', 'delLocal', [storage, ir.str_literal(target.id)], 'PyObject')),
                     )
                 else:
                     assert resolution is NameResolution.GLOBAL, resolution
                     if target.id not in self.module_scope().info.locals:
-                        code = ir.static_method_call_statement('Runtime', 'delGlobal', [ir.Null(), ir.StrLiteral(target.id)])
+                        code = ir.static_method_call_statement('Runtime', 'delGlobal', [ir.NULL, ir.str_literal(target.id)])
                     else:
                         storage = self.ident_expr_by_resolution(target.id, resolution)
-                        code = ir.AssignStatement(storage, ir.StaticMethodCall('Runtime', 'delGlobal', [storage, ir.StrLiteral(target.id)], 'PyObject'))
+                        code = ir.AssignStatement(storage, ir.StaticMethodCall('Runtime', 'delGlobal', [storage, ir.str_literal(target.id)], 'PyObject'))
             elif isinstance(target, ast.Attribute):
-                code = ir.method_call_statement(self.visit(target.value), 'delAttr', [ir.StrLiteral(target.attr)])
+                code = ir.method_call_statement(self.visit(target.value), 'delAttr', [ir.str_literal(target.attr)])
             elif isinstance(target, ast.Subscript):
                 code = ir.method_call_statement(self.visit(target.value), 'delItem', [self.visit(target.slice)])
             else:
@@ -2297,7 +2347,7 @@ class LoweringVisitor(ast.NodeVisitor):
         assert self.scope.info.kind is ScopeKind.FUNCTION, node
         if self.scope.expected_return_java_type == 'NoReturn':
             self.error(node.lineno, 'NoReturn helper functions may not contain return statements')
-        value = self.visit(node.value) if node.value else ir.PyConstant(None)
+        value = self.visit(node.value) if node.value else ir.py_constant(None)
         if self.scope.expected_return_java_type is not None and self.scope.expected_return_java_type not in {'PyObject', 'NoReturn'}:
             value = ir.CastExpr(self.scope.expected_return_java_type, value)
         self.code.append(ir.ReturnStatement(value))
@@ -2330,10 +2380,12 @@ class LoweringVisitor(ast.NodeVisitor):
         yield
         self.break_name = saved
 
+    # same as new_block(), without the generator-based context manager, since every compound statement goes through here
     def visit_block(self, statements: list[ast.stmt]) -> list[ir.Statement]:
-        with self.new_block() as body:
-            for statement in statements:
-                self.visit(statement)
+        saved = self.code
+        self.code = body = []
+        self.visit_statements(statements)
+        self.code = saved
         return body
 
     def visit_If(self, node) -> None:
@@ -2366,12 +2418,12 @@ class LoweringVisitor(ast.NodeVisitor):
                 'PyTuple': 'PyObject[]',
             }[iterable_java_type]
             return [ir.ForEachStatement('var', temp_element, ir.Field(iterable, 'items', items_type), [
-                *self.emit_bind(target, ir.Identifier(temp_element)),
+                *self.emit_bind(target, ir.identifier(temp_element)),
                 *body,
             ])]
         elif iterable_java_type == 'PyDict':
             return [ir.ForEachStatement('var', temp_element, ir.MethodCall(ir.Field(iterable, 'items', 'LinkedHashMap<PyObject, PyObject>'), 'keySet', []), [
-                *self.emit_bind(target, ir.Identifier(temp_element)),
+                *self.emit_bind(target, ir.identifier(temp_element)),
                 *body,
             ])]
         elif iterable_java_type in {'PyBytes', 'PyByteArray'}:
@@ -2379,7 +2431,7 @@ class LoweringVisitor(ast.NodeVisitor):
                 *self.emit_bind(
                     target,
                     ir.CreateObject('PyInt', [
-                        ir.BinaryOp('&', ir.CastExpr('long', ir.Identifier(temp_element, 'byte')), ir.IntLiteral(255, 'L')),
+                        ir.BinaryOp('&', ir.CastExpr('long', ir.identifier(temp_element, 'byte')), ir.int_literal(255, 'L')),
                     ]),
                 ),
                 *body,
@@ -2387,46 +2439,50 @@ class LoweringVisitor(ast.NodeVisitor):
         elif iterable_java_type == 'PyRange':
             if isinstance(iterable, ir.CreateObject) and isinstance(iterable.args[2], ir.IntLiteral) and iterable.args[2].value > 0:
                 (start_expr, stop_expr, step_expr) = iterable.args
+                (temp_start, temp_stop, temp_current) = self.scope.make_temps(3)
                 return [
-                    ir.LocalDecl('final long', temp_start := self.scope.make_temp(), start_expr),
-                    ir.LocalDecl('final long', temp_stop := self.scope.make_temp(), stop_expr),
+                    ir.LocalDecl('final long', temp_start, start_expr),
+                    ir.LocalDecl('final long', temp_stop, stop_expr),
                     ir.ForStatement(
-                        'long', temp_current := self.scope.make_temp(), ir.Identifier(temp_start),
-                        ir.BinaryOp('<', ir.Identifier(temp_current), ir.Identifier(temp_stop)),
-                        temp_current, ir.StaticMethodCall('Math', 'addExact', [ir.Identifier(temp_current), step_expr], 'long'),
+                        'long', temp_current, ir.identifier(temp_start),
+                        ir.BinaryOp('<', ir.identifier(temp_current), ir.identifier(temp_stop)),
+                        temp_current, ir.StaticMethodCall('Math', 'addExact', [ir.identifier(temp_current), step_expr], 'long'),
                         [
-                            *self.emit_bind(target, ir.CreateObject('PyInt', [ir.Identifier(temp_current)])),
+                            *self.emit_bind(target, ir.CreateObject('PyInt', [ir.identifier(temp_current)])),
                             *body,
                         ]
                     ),
                 ]
+            (temp_range, temp_stop, temp_step, temp_current) = self.scope.make_temps(4)
             return [
-                ir.LocalDecl('final var', temp_range := self.scope.make_temp(), iterable),
-                ir.LocalDecl('final long', temp_stop := self.scope.make_temp(), ir.Field(ir.Identifier(temp_range), 'stop', 'long')),
-                ir.LocalDecl('final long', temp_step := self.scope.make_temp(), ir.Field(ir.Identifier(temp_range), 'step', 'long')),
+                ir.LocalDecl('final var', temp_range, iterable),
+                ir.LocalDecl('final long', temp_stop, ir.Field(ir.identifier(temp_range), 'stop', 'long')),
+                ir.LocalDecl('final long', temp_step, ir.Field(ir.identifier(temp_range), 'step', 'long')),
                 ir.ForStatement(
-                    'long', temp_current := self.scope.make_temp(), ir.Field(ir.Identifier(temp_range), 'start', 'long'),
+                    'long', temp_current, ir.Field(ir.identifier(temp_range), 'start', 'long'),
                     ir.CondOp(
-                        ir.BinaryOp('>', ir.Identifier(temp_step), ir.IntLiteral(0)),
-                        ir.BinaryOp('<', ir.Identifier(temp_current), ir.Identifier(temp_stop)),
-                        ir.BinaryOp('>', ir.Identifier(temp_current), ir.Identifier(temp_stop)),
+                        ir.BinaryOp('>', ir.identifier(temp_step), ir.int_literal(0)),
+                        ir.BinaryOp('<', ir.identifier(temp_current), ir.identifier(temp_stop)),
+                        ir.BinaryOp('>', ir.identifier(temp_current), ir.identifier(temp_stop)),
                     ),
-                    temp_current, ir.StaticMethodCall('Math', 'addExact', [ir.Identifier(temp_current), ir.Identifier(temp_step)], 'long'),
+                    temp_current, ir.StaticMethodCall('Math', 'addExact', [ir.identifier(temp_current), ir.identifier(temp_step)], 'long'),
                     [
-                        *self.emit_bind(target, ir.CreateObject('PyInt', [ir.Identifier(temp_current)])),
+                        *self.emit_bind(target, ir.CreateObject('PyInt', [ir.identifier(temp_current)])),
                         *body,
                     ]
                 ),
             ]
         else:
+            temp_iter = ir.identifier(self.scope.make_temp())
+            element = ir.identifier(temp_element)
             return [
-                ir.LocalDecl('var', temp_iter := self.scope.make_temp(), ir.py_iter(iterable)),
+                ir.LocalDecl('var', temp_iter.name, ir.py_iter(iterable)),
                 ir.ForStatement(
-                    'var', temp_element, ir.MethodCall(ir.Identifier(temp_iter), 'next', []),
-                    ir.BinaryOp('!=', ir.Identifier(temp_element), ir.Null()),
-                    temp_element, ir.MethodCall(ir.Identifier(temp_iter), 'next', []),
+                    'var', temp_element, ir.MethodCall(temp_iter, 'next', []),
+                    ir.BinaryOp('!=', element, ir.NULL),
+                    temp_element, ir.MethodCall(temp_iter, 'next', []),
                     [
-                        *self.emit_bind(target, ir.Identifier(temp_element)),
+                        *self.emit_bind(target, element),
                         *body,
                     ]
                 ),
@@ -2451,14 +2507,14 @@ class LoweringVisitor(ast.NodeVisitor):
 
         self.code.append(ir.LocalDecl('var', temp_name := self.scope.make_temp(), self.visit(item.context_expr)))
         if item.optional_vars is None:
-            self.code.append(ir.method_call_statement(ir.Identifier(temp_name), 'enter', []))
+            self.code.append(ir.method_call_statement(ir.identifier(temp_name), 'enter', []))
         else:
-            self.code.extend(self.emit_bind(item.optional_vars, ir.MethodCall(ir.Identifier(temp_name), 'enter', [])))
+            self.code.extend(self.emit_bind(item.optional_vars, ir.MethodCall(ir.identifier(temp_name), 'enter', [])))
 
         body = self.visit_block(node.body)
 
         self.code.append(ir.TryStatement(body, None, None, [], [
-            ir.method_call_statement(ir.Identifier(temp_name), 'exit', []),
+            ir.method_call_statement(ir.identifier(temp_name), 'exit', []),
         ]))
 
     def visit_Try(self, node) -> None:
@@ -2484,17 +2540,16 @@ class LoweringVisitor(ast.NodeVisitor):
             handler = node.handlers[0]
             with self.new_block() as catch_body:
                 if handler.type is not None:
-                    caught_exc = ir.Field(ir.Identifier(exc_name), 'exc')
+                    caught_exc = ir.Field(ir.identifier(exc_name), 'exc')
                     expected_exc = ir.Identifier(f'Py{cast(ast.Name, handler.type).id}')
                     catch_body.extend(ir.if_statement(
                         ir.unary_op('!', ir.BinaryOp('instanceof', caught_exc, expected_exc)),
-                        [ir.ThrowStatement(ir.Identifier(exc_name))],
+                        [ir.ThrowStatement(ir.identifier(exc_name))],
                         [],
                     ))
                 if handler.name is not None:
-                    catch_body.append(ir.AssignStatement(self.ident_expr(handler.name), ir.Field(ir.Identifier(exc_name), 'exc')))
-                for statement in handler.body:
-                    self.visit(statement)
+                    catch_body.append(ir.AssignStatement(self.ident_expr(handler.name), ir.Field(ir.identifier(exc_name), 'exc')))
+                self.visit_statements(handler.body)
 
         finally_body = self.visit_block(node.finalbody)
 
@@ -2514,7 +2569,7 @@ class LoweringVisitor(ast.NodeVisitor):
             # Avoid "not a statement" javac errors by assigning otherwise-unused values to a temp.
             # Cannot remove these statements because we rely on javac here to catch some portion of
             # Python usage errors.
-            self.code.append(ir.AssignStatement(ir.Identifier('expr_discard'), value))
+            self.code.append(ir.AssignStatement(ir.identifier('expr_discard'), value))
             self.scope.used_expr_discard = True
 
     def get_supported_params(self, lineno: int, args: ast.arguments) -> list[inspect.Parameter]:
@@ -2590,7 +2645,7 @@ class LoweringVisitor(ast.NodeVisitor):
         func_decls: list[ir.Decl] = [
             *(ir.FieldDecl('private final', 'PyCell', f'pycell_{name}', None) for name in free_var_names),
             ir.ConstructorDecl('', java_name, constructor_args, [
-                ir.SuperConstructorCall([ir.StrLiteral(py_name), ir.StrLiteral(qualname)]),
+                ir.SuperConstructorCall([ir.str_literal(py_name), ir.str_literal(qualname)]),
                 *(ir.AssignStatement(ir.Identifier(f'pycell_{name}'), ir.Identifier(f'_pycell_{name}')) for name in free_var_names),
             ]),
         ]
@@ -2598,35 +2653,35 @@ class LoweringVisitor(ast.NodeVisitor):
         if shape.posonly_params and not shape.poskw_params:
             if n_required == n_args:
                 call_body = [
-                    ir.method_call_statement(ir.Identifier('PyRuntime'), 'pyfunc_require_user_exact_positional', [
-                        ir.CreateObject('PyInt', [ir.Field(ir.Identifier('args'), 'length')]),
-                        ir.Identifier('kwargs'),
+                    ir.method_call_statement(ir.identifier('PyRuntime'), 'pyfunc_require_user_exact_positional', [
+                        ir.CreateObject('PyInt', [ir.Field(ir.identifier('args'), 'length')]),
+                        ir.identifier('kwargs'),
                         ir.PyConstant(qualname),
                         ir.PyConstant(tuple(arg_names)),
                     ]),
                     ir.ReturnStatement(ir.MethodCall(
-                        ir.This(),
+                        ir.THIS,
                         'callPositional',
-                        [ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)) for i in range(n_args)],
+                        [ir.ArrayAccess(ir.identifier('args'), ir.int_literal(i)) for i in range(n_args)],
                     )),
                 ]
             else:
                 call_body = [
-                    ir.LocalDecl('int', 'argsLength', ir.Field(ir.Identifier('args'), 'length')),
-                    ir.method_call_statement(ir.Identifier('PyRuntime'), 'pyfunc_require_user_min_max_positional', [
-                        ir.CreateObject('PyInt', [ir.Identifier('argsLength')]),
-                        ir.Identifier('kwargs'),
+                    ir.LocalDecl('int', 'argsLength', ir.Field(ir.identifier('args'), 'length')),
+                    ir.method_call_statement(ir.identifier('PyRuntime'), 'pyfunc_require_user_min_max_positional', [
+                        ir.CreateObject('PyInt', [ir.identifier('argsLength')]),
+                        ir.identifier('kwargs'),
                         ir.PyConstant(qualname),
                         ir.PyConstant(tuple(arg_names)),
                         ir.PyConstant(n_required),
                     ]),
-                    ir.ReturnStatement(ir.MethodCall(ir.This(), 'callPositional', [
-                        *(ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)) for i in range(n_required)),
+                    ir.ReturnStatement(ir.MethodCall(ir.THIS, 'callPositional', [
+                        *(ir.ArrayAccess(ir.identifier('args'), ir.int_literal(i)) for i in range(n_required)),
                         *(
                             ir.CondOp(
-                                ir.BinaryOp('>', ir.Identifier('argsLength'), ir.IntLiteral(i)),
-                                ir.ArrayAccess(ir.Identifier('args'), ir.IntLiteral(i)),
-                                ir.Null(),
+                                ir.BinaryOp('>', ir.identifier('argsLength'), ir.int_literal(i)),
+                                ir.ArrayAccess(ir.identifier('args'), ir.int_literal(i)),
+                                ir.NULL,
                             )
                             for i in range(n_required, n_args)
                         ),
@@ -2635,26 +2690,26 @@ class LoweringVisitor(ast.NodeVisitor):
         else:
             call_body = [
                 ir.LocalDecl('var', 'boundArgs', ir.Field(ir.StaticMethodCall('PyRuntime', 'pyfunc_bind_user_function', [
-                    ir.CreateObject('PyTuple', [ir.Identifier('args')]),
-                    ir.Identifier('kwargs'),
+                    ir.CreateObject('PyTuple', [ir.identifier('args')]),
+                    ir.identifier('kwargs'),
                     ir.PyConstant(qualname),
                     ir.PyConstant(tuple(arg_names)),
                     ir.PyConstant(n_required),
                     ir.PyConstant(len(shape.posonly_params)),
                 ]), 'items')),
                 ir.ReturnStatement(ir.MethodCall(
-                    ir.This(),
+                    ir.THIS,
                     'callPositional',
-                    [ir.MethodCall(ir.Identifier('boundArgs'), 'get', [ir.IntLiteral(i)]) for i in range(n_args)],
+                    [ir.MethodCall(ir.identifier('boundArgs'), 'get', [ir.int_literal(i)]) for i in range(n_args)],
                 )),
             ]
         func_decls.append(ir.MethodDecl('@Override public', 'PyObject', 'call', ['PyObject[] args', 'PyDict kwargs'], call_body))
         call_positional_body: list[ir.Statement] = [
-            *(ir.IfStatement(
-                ir.BinaryOp('==', ir.Identifier(name), ir.Null()),
-                [ir.AssignStatement(ir.Identifier(name), emit_default_java_expr(arg_defaults[i]))],
+            ir.IfStatement(
+                ir.BinaryOp('==', ir.Identifier(name), ir.NULL),
+                [ir.AssignStatement(ir.Identifier(name), emit_default_java_expr(default))],
                 [],
-            ) for (i, name) in enumerate(bind_arg_names[n_required:])),
+            ) for (name, default) in zip(bind_arg_names[n_required:], arg_defaults, strict=True)
         ]
         if self.scope.used_expr_discard:
             call_positional_body.append(ir.LocalDecl('PyObject', 'expr_discard', None))
@@ -2662,12 +2717,12 @@ class LoweringVisitor(ast.NodeVisitor):
             if arg_name in self.scope.info.cell_vars:
                 call_positional_body.append(ir.LocalDecl('PyCell', f'pycell_{arg_name}', ir.CreateObject('PyCell', [ir.Identifier(bind_arg_name)])))
             else:
-                call_positional_body.append(ir.LocalDecl(self.java_local_type(arg_name), f'pylocal_{arg_name}', self.cast_local_assignment(arg_name, ir.Identifier(bind_arg_name))))
-        for name in sorted(self.scope.info.cell_vars - set(arg_names)):
-            call_positional_body.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.Null()])))
-        for name in sorted(self.scope.info.locals - self.scope.info.cell_vars - set(arg_names) - set(self.scope.info.initial_builtin_module_locals)):
-            if name not in arg_names:
-                call_positional_body.append(ir.LocalDecl(self.java_local_type(name), f'pylocal_{name}', ir.Null()))
+                call_positional_body.append(ir.LocalDecl(self.java_local_type(arg_name), pylocal_name(arg_name), self.cast_local_assignment(arg_name, ir.Identifier(bind_arg_name))))
+        arg_name_set = set(arg_names)
+        for name in sorted(self.scope.info.cell_vars - arg_name_set):
+            call_positional_body.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.NULL])))
+        for name in sorted(self.scope.info.locals - self.scope.info.cell_vars - arg_name_set - set(self.scope.info.initial_builtin_module_locals)):
+            call_positional_body.append(ir.LocalDecl(self.java_local_type(name), pylocal_name(name), ir.NULL))
         call_positional_body.extend(ir.block_simplify(body))
         func_decls.append(ir.MethodDecl(
             'public',
@@ -2756,14 +2811,14 @@ class LoweringVisitor(ast.NodeVisitor):
                 ]),
             ]),
             ir.MethodDecl('public static', 'PyObject', 'newObj', ['PyConcreteType type', 'PyObject[] args', 'PyDict kwargs'], [
-                ir.method_call_statement(ir.Identifier('Runtime'), 'requireNoKwArgs', [
-                    ir.Identifier('kwargs'),
-                    ir.MethodCall(ir.Identifier('type'), 'name', []),
+                ir.method_call_statement(ir.identifier('Runtime'), 'requireNoKwArgs', [
+                    ir.identifier('kwargs'),
+                    ir.MethodCall(ir.identifier('type'), 'name', []),
                 ]),
                 ir.IfStatement(
-                    ir.BinaryOp('!=', ir.Field(ir.Identifier('args'), 'length'), ir.IntLiteral(0)),
+                    ir.BinaryOp('!=', ir.Field(ir.identifier('args'), 'length'), ir.int_literal(0)),
                     [ir.ThrowStatement(ir.StaticMethodCall('PyTypeError', 'raise', [
-                        ir.BinaryOp('+', ir.MethodCall(ir.Identifier('type'), 'name', []), ir.StrLiteral('() takes no arguments')),
+                        ir.BinaryOp('+', ir.MethodCall(ir.identifier('type'), 'name', []), ir.str_literal('() takes no arguments')),
                     ]))],
                     [],
                 ),
@@ -2773,22 +2828,22 @@ class LoweringVisitor(ast.NodeVisitor):
 
         class_decls: list[ir.ClassDecl] = []
         class_decls.append(ir.ClassDecl('private static final', java_name, 'PyUserObject', [
-            *(ir.FieldDecl('private', 'PyObject', f'pyslot_{name}', ir.Null()) for name in real_slots),
+            *(ir.FieldDecl('private', 'PyObject', f'pyslot_{name}', ir.NULL) for name in real_slots),
             *constructor_decls,
             *(
                 ir.MethodDecl('static', 'PyObject', f'pyget_{name}', ['PyObject obj'], [
                     ir.IfStatement(
-                        ir.BinaryOp('==', ir.Field(ir.CastExpr(java_name, ir.Identifier('obj')), f'pyslot_{name}'), ir.Null()),
-                        [ir.ThrowStatement(ir.MethodCall(ir.CastExpr(java_name, ir.Identifier('obj')), 'raiseMissingAttr', [ir.StrLiteral(name)]))],
+                        ir.BinaryOp('==', ir.Field(ir.CastExpr(java_name, ir.identifier('obj')), f'pyslot_{name}'), ir.NULL),
+                        [ir.ThrowStatement(ir.MethodCall(ir.CastExpr(java_name, ir.identifier('obj')), 'raiseMissingAttr', [ir.str_literal(name)]))],
                         [],
                     ),
-                    ir.ReturnStatement(ir.Field(ir.CastExpr(java_name, ir.Identifier('obj')), f'pyslot_{name}')),
+                    ir.ReturnStatement(ir.Field(ir.CastExpr(java_name, ir.identifier('obj')), f'pyslot_{name}')),
                 ])
                 for name in real_slots
             ),
             *(
                 ir.MethodDecl('static', 'void', f'pyset_{name}', ['PyObject obj', 'PyObject value'], [
-                    ir.AssignStatement(ir.Field(ir.CastExpr(java_name, ir.Identifier('obj')), f'pyslot_{name}'), ir.Identifier('value')),
+                    ir.AssignStatement(ir.Field(ir.CastExpr(java_name, ir.identifier('obj')), f'pyslot_{name}'), ir.identifier('value')),
                     ir.ReturnStatement(),
                 ])
                 for name in real_slots
@@ -2796,11 +2851,11 @@ class LoweringVisitor(ast.NodeVisitor):
             *(
                 ir.MethodDecl('static', 'void', f'pydel_{name}', ['PyObject obj'], [
                     ir.IfStatement(
-                        ir.BinaryOp('==', ir.Field(ir.CastExpr(java_name, ir.Identifier('obj')), f'pyslot_{name}'), ir.Null()),
-                        [ir.ThrowStatement(ir.MethodCall(ir.CastExpr(java_name, ir.Identifier('obj')), 'raiseMissingAttr', [ir.StrLiteral(name)]))],
+                        ir.BinaryOp('==', ir.Field(ir.CastExpr(java_name, ir.identifier('obj')), f'pyslot_{name}'), ir.NULL),
+                        [ir.ThrowStatement(ir.MethodCall(ir.CastExpr(java_name, ir.identifier('obj')), 'raiseMissingAttr', [ir.str_literal(name)]))],
                         [],
                     ),
-                    ir.AssignStatement(ir.Field(ir.CastExpr(java_name, ir.Identifier('obj')), f'pyslot_{name}'), ir.Null()),
+                    ir.AssignStatement(ir.Field(ir.CastExpr(java_name, ir.identifier('obj')), f'pyslot_{name}'), ir.NULL),
                     ir.ReturnStatement(),
                 ])
                 for name in real_slots
@@ -2812,35 +2867,35 @@ class LoweringVisitor(ast.NodeVisitor):
         type_decls.append(ir.ClassDecl('static final', 'AttrsHolder', None, [
             ir.FieldDecl('static final', 'PyGetSetDescriptor', 'pyattr___dict__',
                 ir.CreateObject('PyGetSetDescriptor', [
-                    ir.Identifier('singleton'),
-                    ir.StrLiteral('__dict__'),
+                    ir.identifier('singleton'),
+                    ir.str_literal('__dict__'),
                     ir.MethodRef('PyUserObject', 'pyget___dict__'),
-                    ir.Null(),
+                    ir.NULL,
                 ])),
             *(
                 ir.FieldDecl('static final', 'PyMemberDescriptor', f'pyattr_{name}',
                     ir.CreateObject('PyMemberDescriptor', [
-                        ir.Identifier('singleton'),
-                        ir.StrLiteral(name),
+                        ir.identifier('singleton'),
+                        ir.str_literal(name),
                         ir.MethodRef(java_name, f'pyget_{name}'),
                         ir.MethodRef(java_name, f'pyset_{name}'),
                         ir.MethodRef(java_name, f'pydel_{name}'),
-                        ir.Null(),
+                        ir.NULL,
                     ]))
                 for name in real_slots
             ),
             ir.FieldDecl('static final', 'java.util.LinkedHashMap<PyObject, PyObject>', 'attrs',
-                ir.CreateObject('java.util.LinkedHashMap<PyObject, PyObject>', [ir.IntLiteral(len(real_slots) + (1 if has_instance_dict else 0))])),
+                ir.CreateObject('java.util.LinkedHashMap<PyObject, PyObject>', [ir.int_literal(len(real_slots) + (1 if has_instance_dict else 0))])),
             ir.StaticBlock([
                 *(
-                    [ir.method_call_statement(ir.Identifier('attrs'), 'put', [
-                        ir.CreateObject('PyString', [ir.StrLiteral('__dict__')]),
-                        ir.Identifier('pyattr___dict__'),
+                    [ir.method_call_statement(ir.identifier('attrs'), 'put', [
+                        ir.CreateObject('PyString', [ir.str_literal('__dict__')]),
+                        ir.identifier('pyattr___dict__'),
                     ])] if has_instance_dict else []
                 ),
                 *(
-                    ir.method_call_statement(ir.Identifier('attrs'), 'put', [
-                        ir.CreateObject('PyString', [ir.StrLiteral(name)]),
+                    ir.method_call_statement(ir.identifier('attrs'), 'put', [
+                        ir.CreateObject('PyString', [ir.str_literal(name)]),
                         ir.Identifier(f'pyattr_{name}'),
                     ])
                     for name in real_slots
@@ -2850,23 +2905,23 @@ class LoweringVisitor(ast.NodeVisitor):
         qualname = self.qualname(node.name)
         type_decls.extend([
             ir.ConstructorDecl('private', type_class_name, [], [
-                ir.SuperConstructorCall([ir.StrLiteral(node.name), ir.StrLiteral(qualname), ir.StrLiteral('__main__'),
-                    ir.Field(ir.Identifier(java_name), 'class'), ir.Field(ir.Identifier('PyObjectType'), 'singleton'), ir.Null()]),
+                ir.SuperConstructorCall([ir.str_literal(node.name), ir.str_literal(qualname), ir.str_literal('__main__'),
+                    ir.Field(ir.Identifier(java_name), 'class'), ir.Field(ir.identifier('PyObjectType'), 'singleton'), ir.NULL]),
             ]),
             ir.MethodDecl('@Override public', 'PyObject', 'call', ['PyObject[] args', 'PyDict kwargs'], [
-                ir.ReturnStatement(ir.StaticMethodCall(java_name, 'newObj', [ir.This(), ir.Identifier('args'), ir.Identifier('kwargs')])),
+                ir.ReturnStatement(ir.StaticMethodCall(java_name, 'newObj', [ir.THIS, ir.identifier('args'), ir.identifier('kwargs')])),
             ]),
         ])
         type_decls.extend([
             ir.MethodDecl('@Override public', 'java.util.Map<PyObject, PyObject>', 'getAttributes', [], [
-                ir.ReturnStatement(ir.Field(ir.Identifier('AttrsHolder'), 'attrs')),
+                ir.ReturnStatement(ir.Field(ir.identifier('AttrsHolder'), 'attrs')),
             ]),
         ])
         type_decls.append(ir.MethodDecl('@Override public', 'PyObject', 'lookupAttr', ['String name'], [
-            ir.SwitchStatement(ir.Identifier('name'), [
-                ir.SwitchCase(ir.StrLiteral('__dict__'), ir.Field(ir.Identifier('AttrsHolder'), 'pyattr___dict__')),
-                *(ir.SwitchCase(ir.StrLiteral(name), ir.Field(ir.Identifier('AttrsHolder'), f'pyattr_{name}')) for name in real_slots),
-            ], ir.MethodCall(ir.This(), 'lookupBaseAttr', [ir.Identifier('name')])),
+            ir.SwitchStatement(ir.identifier('name'), [
+                ir.SwitchCase(ir.str_literal('__dict__'), ir.Field(ir.identifier('AttrsHolder'), 'pyattr___dict__')),
+                *(ir.SwitchCase(ir.str_literal(name), ir.Field(ir.identifier('AttrsHolder'), f'pyattr_{name}')) for name in real_slots),
+            ], ir.MethodCall(ir.THIS, 'lookupBaseAttr', [ir.identifier('name')])),
         ]))
         class_decls.append(ir.ClassDecl('private static final', type_class_name, 'PyConcreteType', type_decls))
         for class_decl in class_decls:
@@ -2914,24 +2969,24 @@ class LoweringVisitor(ast.NodeVisitor):
             with self.new_block() as body:
                 temp_result = self.scope.make_temp()
                 statements: list[ir.Statement] = [
-                    ir.method_call_statement(ir.Identifier(temp_result), method_name, [self.visit(elt) for elt in elts])
+                    ir.method_call_statement(ir.identifier(temp_result), method_name, [self.visit(elt) for elt in elts])
                 ]
                 for (i, generator) in enumerate(reversed(generators)):
-                    iterable = ir.Identifier('iterable', iterable_java_type) if i == len(generators)-1 else self.visit(generator.iter)
+                    iterable = ir.identifier('iterable', iterable_java_type) if i == len(generators)-1 else self.visit(generator.iter)
                     statements = self._lower_comp_generator(generator, iterable, statements)
                 body += [
                     ir.LocalDecl('var', temp_result, ir.CreateObject(type_name, [])),
                     *statements,
-                    ir.ReturnStatement(ir.Identifier(temp_result)),
+                    ir.ReturnStatement(ir.identifier(temp_result)),
                 ]
             free_var_names = sorted(self.scope.free_vars)
             call_body: list[ir.Statement] = []
             if self.scope.used_expr_discard:
                 call_body.append(ir.LocalDecl('PyObject', 'expr_discard', None))
             for name in sorted(self.scope.info.cell_vars):
-                call_body.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.Null()])))
+                call_body.append(ir.LocalDecl('PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.NULL])))
             for name in sorted(self.scope.info.locals - self.scope.info.cell_vars - set(self.scope.info.initial_builtin_module_locals)):
-                call_body.append(ir.LocalDecl(self.java_local_type(name), f'pylocal_{name}', ir.Null()))
+                call_body.append(ir.LocalDecl(self.java_local_type(name), pylocal_name(name), ir.NULL))
             call_body.extend(ir.block_simplify(body))
             assert java_name not in self.classes
             self.classes[java_name] = ir.ClassDecl('private static final', java_name, None, [
@@ -2980,32 +3035,32 @@ class LoweringVisitor(ast.NodeVisitor):
             self.scope.locals_are_fields = True
             with self.new_block() as next_body:
                 temp_item = self.scope.make_temp()
-                temp_item_expr = ir.Identifier(temp_item)
+                temp_item_expr = ir.identifier(temp_item)
                 next_body.append(ir.LocalDecl('PyObject', temp_item, None))
                 body: list[ir.Statement] = [ir.ReturnStatement(self.visit(node.elt))]
                 for _if in reversed(generator.ifs):
                     body = list(ir.if_statement(self.emit_condition(_if), body, [ir.ContinueStatement()]))
                 body = [
-                    ir.AssignStatement(temp_item_expr, ir.MethodCall(ir.Identifier('pyiter_iterable'), 'next', [])),
-                    *ir.if_statement(ir.BinaryOp('==', temp_item_expr, ir.Null()), [ir.ReturnStatement(ir.Null())], []),
+                    ir.AssignStatement(temp_item_expr, ir.MethodCall(ir.identifier('pyiter_iterable'), 'next', [])),
+                    *ir.if_statement(ir.BinaryOp('==', temp_item_expr, ir.NULL), [ir.ReturnStatement(ir.NULL)], []),
                     *self.emit_bind(generator.target, temp_item_expr),
                     *body,
                 ]
-                next_body.extend(ir.while_statement(ir.Bool(True), body))
+                next_body.extend(ir.while_statement(ir.TRUE, body))
 
             free_var_names = sorted(self.scope.free_vars)
             ctor_args = [*(f'PyCell _pycell_{name}' for name in free_var_names), f'{iterable_java_type} iterable']
             ctor_body: list[ir.Statement] = [
-                ir.SuperConstructorCall([ir.StrLiteral('<genexpr>'), ir.StrLiteral(qualname)]),
+                ir.SuperConstructorCall([ir.str_literal('<genexpr>'), ir.str_literal(qualname)]),
                 *(ir.AssignStatement(ir.Identifier(f'pycell_{name}'), ir.Identifier(f'_pycell_{name}')) for name in free_var_names),
-                ir.AssignStatement(ir.Identifier('pyiter_iterable'), ir.py_iter(ir.Identifier('iterable'))),
+                ir.AssignStatement(ir.identifier('pyiter_iterable'), ir.py_iter(ir.identifier('iterable'))),
             ]
             assert java_name not in self.classes
             self.classes[java_name] = ir.ClassDecl('private static final', java_name, 'PyGenerator', [
                 *(ir.FieldDecl('private final', 'PyCell', f'pycell_{name}', None) for name in free_var_names),
                 ir.FieldDecl('private final', 'PyIter', 'pyiter_iterable', None),
-                *(ir.FieldDecl('private final', 'PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.Null()])) for name in sorted(self.scope.info.cell_vars)),
-                *(ir.FieldDecl('private', 'PyObject', f'pylocal_{name}', ir.Null()) for name in sorted(self.scope.info.locals - self.scope.info.cell_vars)),
+                *(ir.FieldDecl('private final', 'PyCell', f'pycell_{name}', ir.CreateObject('PyCell', [ir.NULL])) for name in sorted(self.scope.info.cell_vars)),
+                *(ir.FieldDecl('private', 'PyObject', pylocal_name(name), ir.NULL) for name in sorted(self.scope.info.locals - self.scope.info.cell_vars)),
                 ir.ConstructorDecl('', java_name, ctor_args, ctor_body),
                 ir.MethodDecl('@Override public', 'PyObject', 'next', [], next_body),
             ])
@@ -3020,9 +3075,36 @@ class LoweringVisitor(ast.NodeVisitor):
                 self.n_functions += 1
                 self.final_global_function_classes[statement.name] = java_name
         for statement in node.body:
+            self.scope.used_expr_discard = False
             self.visit(statement)
-
-    def write_java(self, f: TextIO, py_name: str, argv0: Optional[str] = None) -> None:
+            self.global_code_ends.append((len(self.global_code), self.scope.used_expr_discard))
+
+    def split_global_code(self, max_chunk_nodes: int) -> list[list[ir.Statement]]:
+        """Group the module-level code into chunks of whole top-level statements, each within max_chunk_nodes if possible.
+        Each chunk declares expr_discard itself if any of its statements use it."""
+        chunks: list[list[ir.Statement]] = []
+        chunk: list[ir.Statement] = []
+        chunk_nodes = 0
+        chunk_uses_discard = False
+        def finish_chunk() -> None:
+            chunks.append([ir.LocalDecl('PyObject', 'expr_discard', None), *chunk] if chunk_uses_discard else chunk)
+        start = 0
+        for (end, uses_discard) in self.global_code_ends:
+            code = self.global_code[start:end]
+            start = end
+            n_nodes = ir.count_nodes(code)
+            if chunk and chunk_nodes + n_nodes > max_chunk_nodes:
+                finish_chunk()
+                chunk = []
+                chunk_nodes = 0
+                chunk_uses_discard = False
+            chunk.extend(code)
+            chunk_nodes += n_nodes
+            chunk_uses_discard |= uses_discard
+        finish_chunk()
+        return chunks
+
+    def write_java(self, f: TextIO, py_name: str, argv0: Optional[str] = None, max_chunk_nodes: int = MAX_MODULE_CHUNK_NODES) -> None:
         final_import_fields = {
             bind_name: module_name for (bind_name, module_name) in self.scope.info.initial_builtin_module_locals.items()
             if bind_name in self.scope.info.locals
@@ -3040,22 +3122,31 @@ class LoweringVisitor(ast.NodeVisitor):
             value = self.predefined_global_value(name)
             if value is not None and name not in self.scope.info.locals:
                 predefined_global_fields.append(
-                    ir.FieldDecl('private static final', 'PyString', f'pyglobal_{name}', ir.PyConstant(value))
+                    ir.FieldDecl('private static final', 'PyString', pyglobal_name(name), ir.PyConstant(value))
                 )
         def global_field_decl(name: str) -> ir.FieldDecl:
             value = self.predefined_global_value(name)
-            init = ir.PyConstant(value) if value is not None else ir.Null()
-            return ir.FieldDecl('private static', self.java_global_type(name), f'pyglobal_{name}', init)
+            init = ir.PyConstant(value) if value is not None else ir.NULL
+            return ir.FieldDecl('private static', self.java_global_type(name), pyglobal_name(name), init)
         if argv0 is None:
             argv0 = self.path
+        chunks = self.split_global_code(max_chunk_nodes)
+        chunk_methods: list[ir.Decl] = []
+        main_code = chunks[0]
+        if len(chunks) > 1:
+            main_code = []
+            for (i, chunk) in enumerate(chunks):
+                chunk_name = f'module_body_{i}'
+                chunk_methods.append(ir.MethodDecl('private static', 'void', chunk_name, [], chunk))
+                main_code.append(ir.static_method_call_statement(py_name, chunk_name, []))
         body_decls: list[ir.Decl] = [
             *self.classes.values(),
             *predefined_global_fields,
-            *(ir.FieldDecl('private static final', 'PyObject', f'pyglobal_{name}', ir.Field(ir.Identifier(extract_spec.BUILTIN_MODULES[module_name]), 'singleton'))
+            *(ir.FieldDecl('private static final', 'PyObject', pyglobal_name(name), ir.Field(ir.Identifier(extract_spec.BUILTIN_MODULES[module_name]), 'singleton'))
               for (name, module_name) in sorted(final_import_fields.items())),
-            *(ir.FieldDecl('private static final', java_name, f'pyglobal_{name}', ir.CreateObject(java_name, []))
+            *(ir.FieldDecl('private static final', java_name, pyglobal_name(name), ir.CreateObject(java_name, []))
               for (name, java_name) in sorted(final_function_fields.items())),
-            *(ir.FieldDecl('private static final', extract_spec.BUILTIN_TYPES[self.scope.info.initial_final_constant_types[name]], f'pyglobal_{name}', ir.PyConstant(value))
+            *(ir.FieldDecl('private static final', extract_spec.BUILTIN_TYPES[self.scope.info.initial_final_constant_types[name]], pyglobal_name(name), ir.PyConstant(value))
               for (name, value) in sorted(final_constant_fields.items())),
             *(global_field_decl(name)
               for name in sorted(self.scope.info.locals - set(final_import_fields) - set(final_function_fields) - set(final_constant_fields))),
@@ -3065,20 +3156,21 @@ class LoweringVisitor(ast.NodeVisitor):
                 'main',
                 ['String[] args'],
                 ir.block_simplify([
-                    ir.static_method_call_statement('Runtime', 'setArgv', [ir.StrLiteral(argv0), ir.Identifier('args')]),
+                    ir.static_method_call_statement('Runtime', 'setArgv', [ir.str_literal(argv0), ir.identifier('args')]),
                     ir.TryStatement(
-                        self.global_code,
+                        main_code,
                         'PyRaise',
                         'exc',
-                        [ir.static_method_call_statement('Runtime', 'handleTopLevelPyRaise', [ir.Identifier('exc')])],
+                        [ir.static_method_call_statement('Runtime', 'handleTopLevelPyRaise', [ir.identifier('exc')])],
                         [],
                     ),
                 ]),
             ),
+            *chunk_methods,
         ]
         ir.write_decls(
             f,
-            [ir.with_pooled_fields(ir.ClassDecl('public final', py_name, None, body_decls), self.pool)],
+            [ir.ClassDecl('public final', py_name, None, body_decls, holds_pool=True)],
             self.pool,
         )
 
@@ -3146,7 +3238,7 @@ def get_builtin_type_attr_expr(type_name: str, attr_name: str, attr_kind: str, r
                 singleton = ir.Field(ir.Identifier(f'{java_name}Type'), 'singleton')
                 return ir.MethodCall(attr_expr, 'get', [singleton, singleton])
             return attr_expr
-        return ir.MethodCall(attr_expr, 'get', [ir.Null(), ir.Field(ir.Identifier(f'{java_name}Type'), 'singleton')])
+        return ir.MethodCall(attr_expr, 'get', [ir.NULL, ir.Field(ir.Identifier(f'{java_name}Type'), 'singleton')])
     if type_name == 'type' and attr_kind in {'method', 'wrapper_descriptor'}:
         return attr_expr
     if attr_kind == 'string':
@@ -3188,7 +3280,7 @@ def analyze_params(params: list[inspect.Parameter]) -> SignatureShape:
 
 def emit_default_java_expr(default: object) -> ir.Expr:
     if default is extract_spec.NULL:
-        return ir.Null()
+        return ir.NULL
     return ir.PyConstant(default)
 
 def get_java_name(name: str) -> str:
@@ -3209,7 +3301,7 @@ def get_builtin_module_attr_expr(module_name: str, attr_name: str, kind: str) ->
         module_func_prefix = module_java_name.removesuffix('Module')
         return ir.PyBuiltinFunction(f'{module_name}.{attr_name}', java_name=f'{module_func_prefix}Function_{attr_name}')
     if kind == 'member':
-        return ir.MethodCall(ir.PyBuiltinModule(module_name, extract_spec.BUILTIN_MODULES[module_name]), 'getAttr', [ir.StrLiteral(attr_name)])
+        return ir.MethodCall(ir.PyBuiltinModule(module_name, extract_spec.BUILTIN_MODULES[module_name]), 'getAttr', [ir.str_literal(attr_name)])
     if kind == 'type':
         java_name = get_java_name(f'{module_name}.{attr_name}')
         return ir.PyBuiltinType(f'{module_name}.{attr_name}', java_name)
@@ -3269,12 +3361,14 @@ def load_semantics_json(path: str) -> dict[str, object]:
     with open(path, encoding='utf-8') as f:
         return cast(dict[str, object], json.load(f))
 
-def translate_python_to_java(spec_path: str, semantics_path: str, py_path: str, java_path: str) -> None:
+def translate_python_to_java(spec_path: str, semantics_path: str, py_path: str, java_path: str,
+                             max_chunk_nodes: int = MAX_MODULE_CHUNK_NODES) -> None:
     with open(py_path, encoding='utf-8') as f:
-        translate_python_source_to_java(spec_path, semantics_path, f.read(), py_path, java_path, argv0=py_path)
+        translate_python_source_to_java(spec_path, semantics_path, f.read(), py_path, java_path, argv0=py_path,
+                                        max_chunk_nodes=max_chunk_nodes)
 
 def translate_python_source_to_java(spec_path: str, semantics_path: str, py_source: str, source_name: str, java_path: str,
-                                    argv0: Optional[str] = None) -> None:
+                                    argv0: Optional[str] = None, max_chunk_nodes: int = MAX_MODULE_CHUNK_NODES) -> None:
     metadata = load_translator_metadata(spec_path, semantics_path)
     (node, scope_infos) = analyze_and_simplify(
         ast.parse(py_source, filename=source_name), metadata=metadata)
@@ -3284,7 +3378,7 @@ def translate_python_source_to_java(spec_path: str, semantics_path: str, py_sour
         raise SystemExit(f'Translation failed: {visitor.n_errors} errors')
     py_name = get_java_main_class_name(source_name)
     with open(java_path, 'w', encoding='utf-8') as f:
-        visitor.write_java(f, py_name, argv0=argv0)
+        visitor.write_java(f, py_name, argv0=argv0, max_chunk_nodes=max_chunk_nodes)
 
 def get_java_main_class_name(source_name: str) -> str:
     base = os.path.basename(source_name)
@@ -3323,6 +3417,8 @@ def run_python_script(spec_path: str, semantics_path: str, runtime_jar_path: str
             build_jar_script,
             '--classpath',
             runtime_jar_path,
+            '--cache-dir',
+            os.path.join(repo_root, '_out', '.jar-cache', 'run'), # temp_dir is discarded, so share a cache across runs
             '-o',
             jar_path,
             java_path,
@@ -3356,6 +3452,8 @@ def build_translate_parser(default_spec_path: str, default_semantics_path: str)
     parser.add_argument('--spec', default=default_spec_path)
     parser.add_argument('--semantics', default=default_semantics_path)
     parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--max-module-chunk-nodes', type=int, default=MAX_MODULE_CHUNK_NODES,
+                        help='split module-level code into methods of about this many IR nodes (lower it to test the split)')
     parser.add_argument('py_path')
     return parser
 
@@ -3387,6 +3485,7 @@ def main() -> None:
             os.path.abspath(args.semantics),
             os.path.abspath(args.py_path),
             os.path.abspath(args.output),
+            max_chunk_nodes=args.max_module_chunk_nodes,
         )
         return
 
@@ -44,4 +44,5 @@ def rules(ctx):
     pythonj_jar = '_out/pythonj.jar'
     script = 'tools/build_jar.py'
     java_files = [pyruntime_java, *RUNTIME_JAVA_FILES]
-    ctx.rule(pythonj_jar, [script, *java_files], cmd=[python, script, '-o', pythonj_jar, *java_files])
+    cds_args = ['--cds'] if ctx.env.get('JAVAC_CDS') else [] # build_jar.py ignores --cds before JDK 19
+    ctx.rule(pythonj_jar, [script, *java_files], cmd=[python, script, *cds_args, '-o', pythonj_jar, *java_files])
@@ -4,22 +4,87 @@
 # SPDX-License-Identifier: MIT
 
 import argparse
+import concurrent.futures
 import difflib
+import functools
 import os
+import re
 import subprocess
 import sys
+import tempfile
 import time
+from typing import BinaryIO, Optional
 
 python = 'py' if os.name == 'nt' else 'python3'
 PYTHONJ_ONLY_TESTS = {'pythonj'}
 
+# -XX:+AutoCreateSharedArchive needs JDK 19+.  Older JDKs still honor -XX:SharedArchiveFile, and pointing it at an archive that
+# does not exist yet can turn class data sharing off entirely, so --cds is refused there rather than silently made slower.
+MIN_CDS_JAVA_VERSION = 19
+
+def java_feature_version() -> int:
+    output = subprocess.run(['java', '-version'], capture_output=True, text=True, check=True).stderr
+    match = re.search(r'version "(?:1\.)?(\d+)', output)
+    if match is None:
+        raise SystemExit(f'ERROR: could not determine the Java version from {output!r}')
+    return int(match.group(1))
+
 def get_default_test_names() -> list[str]:
     return sorted(x[:-3] for x in os.listdir('tests') if x.endswith('.py') and x != 'rules.py')
 
+# Outputs go to temporary files rather than memory, and are only decoded for diffing when they differ
+def run_to_file(cmd: list[str]) -> tuple[BinaryIO, float]:
+    f = tempfile.TemporaryFile()
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd='tests', stdout=f, check=True)
+    exec_time = time.perf_counter() - start
+    f.seek(0)
+    return (f, exec_time)
+
+def same_contents(f0: BinaryIO, f1: BinaryIO) -> bool:
+    while True:
+        chunk = f0.read(1 << 16)
+        if chunk != f1.read(1 << 16):
+            return False
+        if not chunk:
+            return True
+
+# returns (jexec_time, pyexec_time, (cpython output, pythonj output) if mismatched); pyexec_time is None if CPython was not run
+def run_test(py_name: str, cds: bool, verify: bool, overlap: bool) -> tuple[float, Optional[float], Optional[tuple[bytes, bytes]]]:
+    sep = ';' if os.name == 'nt' else ':'
+    java_cmd = ['java']
+    if cds:
+        # dump a class data sharing archive on the first run and map it on later runs (main checks for JDK 19+)
+        java_cmd.extend(['-XX:+AutoCreateSharedArchive', f'-XX:SharedArchiveFile=_out/{py_name}.jsa'])
+    java_cmd.extend(['-cp', f'../_out/pythonj.jar{sep}_out/{py_name}.jar', py_name])
+    if not verify or py_name in PYTHONJ_ONLY_TESTS:
+        (j_file, jexec_time) = run_to_file(java_cmd)
+        j_file.close()
+        return (jexec_time, None, None)
+
+    cpython_cmd = [sys.executable, f'{py_name}.py']
+    if overlap: # the two runs are independent, so run CPython alongside the JVM rather than after it
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as cpython_runner:
+            c_future = cpython_runner.submit(run_to_file, cpython_cmd)
+            (j_file, jexec_time) = run_to_file(java_cmd)
+        (c_file, pyexec_time) = c_future.result()
+    else:
+        (j_file, jexec_time) = run_to_file(java_cmd)
+        (c_file, pyexec_time) = run_to_file(cpython_cmd)
+    with j_file, c_file:
+        if same_contents(c_file, j_file):
+            return (jexec_time, pyexec_time, None)
+        c_file.seek(0)
+        j_file.seek(0)
+        return (jexec_time, pyexec_time, (c_file.read(), j_file.read()))
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument('-c', '--clean', action='store_true', help='clean build outputs first')
     parser.add_argument('-j', '--jobs', type=int, help='number of parallel build jobs')
+    parser.add_argument('-x', '--exec-jobs', type=int, default=1, help='number of tests to run concurrently, also running CPython alongside Java above 1 (timings are less reliable above 1)')
+    parser.add_argument('--cds', action='store_true', help='cache JVM startup state across runs in class data sharing archives, for javac and for each test (requires JDK 19+)')
+    parser.add_argument('--no-verify', action='store_true', help='skip running tests under CPython and comparing outputs')
     parser.add_argument('-v', '--verbose-build', action='store_true', help='show verbose build commands')
     parser.add_argument('py_names', nargs='*', help='names of tests to run')
     args = parser.parse_args()
@@ -28,6 +93,9 @@ def main() -> None:
     if not py_names:
         py_names = get_default_test_names()
 
+    if args.cds and (java_version := java_feature_version()) < MIN_CDS_JAVA_VERSION:
+        raise SystemExit(f'ERROR: --cds requires Java {MIN_CDS_JAVA_VERSION}+, but java is version {java_version}')
+
     start = time.perf_counter()
     make_cmd = [python, 'make.py']
     if args.clean:
@@ -36,35 +104,35 @@ def main() -> None:
         make_cmd.extend(['--jobs', str(args.jobs)])
     if args.verbose_build:
         make_cmd.append('--verbose')
+    if args.cds:
+        make_cmd.extend(['--env', 'JAVAC_CDS=1'])
     make_cmd.extend(f'tests/_out/{py_name}.jar' for py_name in py_names)
     subprocess.check_call(make_cmd)
     build_time = time.perf_counter() - start
     print(f'{build_time=:5.3f}')
 
-    for py_name in py_names:
-        start = time.perf_counter()
-        sep = ';' if os.name == 'nt' else ':'
-        j_output = subprocess.check_output(['java', '-cp', f'../_out/pythonj.jar{sep}_out/{py_name}.jar', py_name], cwd='tests')
-        jexec_time = time.perf_counter() - start
-
-        if py_name in PYTHONJ_ONLY_TESTS:
-            print(f'{py_name:>15}: jexec_time={jexec_time:5.3f} pyexec_time=  n/a (pythonj-only)')
-            continue
-
-        start = time.perf_counter()
-        c_output = subprocess.check_output([sys.executable, f'{py_name}.py'], cwd='tests')
-        pyexec_time = time.perf_counter() - start
-
-        if c_output == j_output:
-            print(f'{py_name:>15}: jexec_time={jexec_time:5.3f} pyexec_time={pyexec_time:5.3f} ({pyexec_time / jexec_time:5.2f}x)')
-        else:
-            print()
-            print(f'ERROR: output mismatched on test {py_name!r}:')
-            c_output_lines = c_output.decode(errors='surrogateescape').splitlines()
-            j_output_lines = j_output.decode(errors='surrogateescape').splitlines()
-            for line in difflib.unified_diff(c_output_lines, j_output_lines, 'cpython output', 'pythonj output', lineterm=''):
-                print(line)
-            raise SystemExit(1)
+    # results are reported in test order regardless of completion order
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(args.exec_jobs, 1))
+    try:
+        for (py_name, (jexec_time, pyexec_time, mismatch)) in zip(py_names, executor.map(functools.partial(run_test, cds=args.cds, verify=not args.no_verify, overlap=args.exec_jobs > 1), py_names)):
+            if pyexec_time is None:
+                reason = 'pythonj-only' if py_name in PYTHONJ_ONLY_TESTS else 'not verified'
+                print(f'{py_name:>15}: jexec_time={jexec_time:5.3f} pyexec_time=  n/a ({reason})')
+                continue
+
+            if mismatch is None:
+                print(f'{py_name:>15}: jexec_time={jexec_time:5.3f} pyexec_time={pyexec_time:5.3f} ({pyexec_time / jexec_time:5.2f}x)')
+            else:
+                (c_output, j_output) = mismatch
+                print()
+                print(f'ERROR: output mismatched on test {py_name!r}:')
+                c_output_lines = c_output.decode(errors='surrogateescape').splitlines()
+                j_output_lines = j_output.decode(errors='surrogateescape').splitlines()
+                for line in difflib.unified_diff(c_output_lines, j_output_lines, 'cpython output', 'pythonj output', lineterm=''):
+                    print(line)
+                raise SystemExit(1)
+    finally: # a failing or mismatched test should not wait for the rest of the queue
+        executor.shutdown(cancel_futures=True)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,23 @@
+# pythonj (https://github.com/mjcraighead/pythonj)
+# Copyright (c) 2012-2026 Matt Craighead
+# SPDX-License-Identifier: MIT
+
+# tests/rules.py translates this with a tiny --max-module-chunk-nodes, so the module body is split across several
+# Java methods.  Globals must carry across the split, and only the first statements discard expression values.
+
+acc = 1
+words = []
+acc if words else 0
+
+for i in range(5):
+    acc = (acc * 31 + i) % 1000003
+    words.append(str(acc % 97))
+print(acc, words)
+
+if acc % 2:
+    acc //= 2
+else:
+    acc = acc * 3 + 1
+print(acc, hex(acc))
+
+print('-'.join(sorted(words)), sum(int(w) for w in words))
@@ -6,9 +6,15 @@ TEST_NAMES = [
     'builtins_smoke',
     'fib',
     'mandelbrot',
+    'module_chunks',
     'pythonj',
 ]
 
+# extra 'pythonj.py translate' arguments for tests that exercise translator limits
+TRANSLATE_ARGS = {
+    'module_chunks': ['--max-module-chunk-nodes', '20'],
+}
+
 def rules(ctx):
     python = 'py' if ctx.host.os == 'windows' else 'python3'
 
@@ -18,17 +24,19 @@ def rules(ctx):
     pythonj_script = '../pythonj.py'
     pythonj_script_deps = ['../extract_spec.py', '../ir.py']
     jar_script = '../tools/build_jar.py'
+    jar_cds_args = ['--cds'] if ctx.env.get('JAVAC_CDS') else [] # build_jar.py ignores --cds before JDK 19
 
     build_outputs = []
     for name in TEST_NAMES:
         py_path = f'{name}.py'
         java_path = f'_out/{name}.java'
         ctx.rule(java_path, [pythonj_script, *pythonj_script_deps, spec_json, semantics_json, py_path],
-            cmd=[python, pythonj_script, 'translate', '--spec', spec_json, '--semantics', semantics_json, py_path, '-o', java_path])
+            cmd=[python, pythonj_script, 'translate', '--spec', spec_json, '--semantics', semantics_json, *TRANSLATE_ARGS.get(name, []),
+                 py_path, '-o', java_path])
 
         jar_path = f'_out/{name}.jar'
         ctx.rule(jar_path, [jar_script, pythonj_jar, java_path],
-            cmd=[python, jar_script, '--classpath', pythonj_jar, '-o', jar_path, java_path])
+            cmd=[python, jar_script, *jar_cds_args, '--classpath', pythonj_jar, '-o', jar_path, java_path])
         build_outputs.append(jar_path)
 
     ctx.rule(':build', build_outputs)
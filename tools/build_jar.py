@@ -5,41 +5,133 @@
 
 import argparse
 import contextlib
+import hashlib
 import os
+import re
 import shutil
 import subprocess
 import tempfile
+import zipfile
+from typing import Optional
+
+JAR_DATE_TIME = (1980, 1, 1, 0, 0, 2) # fixed timestamp so that jars are reproducible
+
+# Written directly with zipfile rather than the jar tool, which would cost another JVM startup per build
+def write_jar(jar_path: str, classes_dir: str) -> None:
+    with zipfile.ZipFile(jar_path, 'w') as jar: # stored, not deflated: these jars are only consumed locally
+        jar.writestr(zipfile.ZipInfo('META-INF/MANIFEST.MF', JAR_DATE_TIME), 'Manifest-Version: 1.0\r\n\r\n')
+        for (dirpath, dirnames, filenames) in os.walk(classes_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                with open(path, 'rb') as f:
+                    jar.writestr(zipfile.ZipInfo(os.path.relpath(path, classes_dir).replace(os.sep, '/'), JAR_DATE_TIME), f.read())
+
+# make.py rebuilds a jar whenever an input is newer, e.g. after any edit to pythonj.py, even if the generated .java is unchanged,
+# and 'pythonj.py run' builds into a fresh temp dir every time.  Remember the last jar built for each output name, keyed by a
+# hash of everything javac sees, so such rebuilds skip javac.  The hash is stored as the cached jar's zip comment, so that the
+# jar and its key are replaced together in one rename, even when several builds share a cache dir.  The key also covers which
+# javac runs and its arguments: switching JDKs must not hand back class files built for a newer class file version.  Since that
+# makes the key specific to the local JDK install, it is kept out of the output jar, which stays reproducible.
+def resolve_javac() -> Optional[str]:
+    javac = shutil.which('javac')
+    return os.path.realpath(javac) if javac is not None else None # PATH entries are often symlinks into the actual JDK
+
+def javac_identity() -> str:
+    javac = resolve_javac()
+    if javac is None:
+        return 'javac' # javac itself will report the problem
+    st = os.stat(javac)
+    return f'{javac}\0{st.st_mtime_ns}\0{st.st_size}'
+
+# -XX:+AutoCreateSharedArchive needs JDK 19+.  Older JDKs still honor -XX:SharedArchiveFile, and pointing it at an archive that
+# does not exist yet can turn class data sharing off entirely, so --cds is ignored there.  The JDK's release file gives the
+# version without paying for another JVM startup.
+MIN_CDS_JAVAC_VERSION = 19
+
+def javac_feature_version() -> Optional[int]:
+    javac = resolve_javac()
+    if javac is None:
+        return None
+    try:
+        with open(os.path.join(os.path.dirname(os.path.dirname(javac)), 'release'), encoding='utf-8') as f:
+            match = re.search(r'^JAVA_VERSION="(?:1\.)?(\d+)', f.read(), re.MULTILINE)
+    except FileNotFoundError:
+        match = re.search(r'^javac (?:1\.)?(\d+)', subprocess.run([javac, '-version'], capture_output=True, text=True).stdout)
+    return int(match.group(1)) if match is not None else None
+
+def inputs_hash(javac_args: list[str], classpath: Optional[str], java_paths: list[str]) -> str:
+    h = hashlib.blake2b()
+    for part in [javac_identity(), *javac_args]:
+        h.update(f'{part}\0'.encode())
+    h.update(b'\0')
+    for path in ([classpath] if classpath is not None else []) + java_paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        h.update(f'{os.path.basename(path)}\0{len(data)}\0'.encode())
+        h.update(data)
+    return h.hexdigest()
+
+# only the zip comment at the end of the file changes, so this is cheap and leaves the entries byte-for-byte identical
+def copy_jar_with_comment(src_path: str, dst_path: str, comment: bytes) -> None:
+    shutil.copyfile(src_path, dst_path)
+    with zipfile.ZipFile(dst_path, 'a') as jar:
+        jar.comment = comment
+
+def cached_jar_matches(path: str, digest: bytes) -> bool:
+    try:
+        with zipfile.ZipFile(path) as jar:
+            return jar.comment == digest
+    except (FileNotFoundError, zipfile.BadZipFile):
+        return False
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument('--classpath')
     parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--cache-dir', help='where to keep the last jar built for each output name (default: .jar-cache next to the output)')
+    parser.add_argument('--cds', action='store_true', help="cache javac's JVM startup state in a class data sharing archive in the cache dir (ignored before JDK 19)")
     parser.add_argument('java_paths', nargs='+')
     args = parser.parse_args()
 
     jar_path = os.path.abspath(args.output)
     jar_dir = os.path.dirname(jar_path)
     tmp_jar_path = f'{jar_path}.tmp'
-    classes_dir = tempfile.mkdtemp(prefix='.java-classes.', dir=jar_dir)
+    classpath = os.path.abspath(args.classpath) if args.classpath is not None else None
     java_paths = [os.path.abspath(path) for path in args.java_paths]
 
-    javac_cmd = ['javac', '-proc:none']
-    if args.classpath is not None:
-        javac_cmd.extend(['-cp', os.path.abspath(args.classpath)])
+    cache_dir = os.path.abspath(args.cache_dir) if args.cache_dir is not None else os.path.join(jar_dir, '.jar-cache')
+    cached_jar_path = os.path.join(cache_dir, os.path.basename(jar_path))
+    javac_args = ['-proc:none']
+    digest = inputs_hash(javac_args, classpath, java_paths).encode()
+    if cached_jar_matches(cached_jar_path, digest):
+        copy_jar_with_comment(cached_jar_path, tmp_jar_path, b'')
+        os.replace(tmp_jar_path, jar_path)
+        return
+
+    javac_cmd = ['javac', *javac_args]
+    if args.cds and (javac_feature_version() or 0) >= MIN_CDS_JAVAC_VERSION:
+        # javac's own startup (loading and linking the compiler's classes) dominates small compiles, so dump it on the first run and
+        # map it on later runs.  Builds sharing the archive may race to create it; the JVM validates archives before mapping them.
+        os.makedirs(cache_dir, exist_ok=True)
+        javac_cmd.extend(['-J-XX:+AutoCreateSharedArchive', f'-J-XX:SharedArchiveFile={os.path.join(cache_dir, "javac.jsa")}'])
+    if classpath is not None:
+        javac_cmd.extend(['-cp', classpath])
+    classes_dir = tempfile.mkdtemp(prefix='.java-classes.', dir=jar_dir)
     javac_cmd.extend(['-d', classes_dir, *java_paths])
 
     try:
         subprocess.check_call(javac_cmd)
-        subprocess.check_call([
-            'jar',
-            '--create',
-            '--file',
-            tmp_jar_path,
-            '--date=1980-01-01T00:00:02Z',
-            '-C',
-            classes_dir,
-            '.',
-        ])
+        write_jar(tmp_jar_path, classes_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        (fd, tmp_cached_jar_path) = tempfile.mkstemp(prefix=f'{os.path.basename(jar_path)}.', suffix='.tmp', dir=cache_dir)
+        os.close(fd)
+        try:
+            copy_jar_with_comment(tmp_jar_path, tmp_cached_jar_path, digest)
+            os.replace(tmp_cached_jar_path, cached_jar_path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_cached_jar_path)
         os.replace(tmp_jar_path, jar_path)
     finally:
         shutil.rmtree(classes_dir, ignore_errors=True)